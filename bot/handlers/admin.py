@@ -24,7 +24,11 @@ async def start_broadcast(message: Message, state: FSMContext):
 
 @router.message(BroadcastStates.waiting_for_message)
 async def process_broadcast_message(message: Message, state: FSMContext):
-    await state.update_data(message=message)
+    await state.update_data(
+        text=message.text,
+        photo=message.photo[-1].file_id if message.photo else None,
+        caption=message.caption
+    )
 
     keyboard = {
         "keyboard": [
@@ -48,15 +52,13 @@ async def process_broadcast_audience(message: Message, state: FSMContext):
         return
 
     data = await state.get_data()
-    broadcast_message = data.get("message")
-
-    if audience == "All drivers":
-        drivers = await db.get_all_drivers()
-    elif audience == "Active drivers":
-        drivers = await db.get_active_drivers()
-    elif audience == "Inactive drivers":
-        drivers = await db.get_inactive_drivers()
-    else:
+
+    audiences = {
+        "All drivers": "all",
+        "Active drivers": "active",
+        "Inactive drivers": "inactive",
+    }
+    if audience not in audiences:
         await message.answer("Invalid audience")
         return
 
@@ -67,20 +69,20 @@ async def process_broadcast_audience(message: Message, state: FSMContext):
     success_count = 0
     fail_count = 0
 
-    await message.answer(f"Starting broadcast to {len(drivers)} drivers...")
+    await message.answer(f"Starting broadcast to {audience.lower()}...")
 
-    for driver in drivers:
+    async for driver in db.iter_drivers(audiences[audience]):
         try:
-            if broadcast_message.photo:
+            if data.get("photo"):
                 await bot.send_photo(
                     chat_id=driver.telegram_id,
-                    photo=broadcast_message.photo[-1].file_id,
-                    caption=broadcast_message.caption
+                    photo=data["photo"],
+                    caption=data.get("caption")
                 )
             else:
                 await bot.send_message(
                     chat_id=driver.telegram_id,
-                    text=broadcast_message.text
+                    text=data.get("text")
                 )
             success_count += 1
         except Exception as e:
@@ -96,20 +98,15 @@ async def process_broadcast_audience(message: Message, state: FSMContext):
 
 @router.message(F.text.in_(["📊 Statistika", "📊 Статистика"]))
 async def show_statistics(message: Message):
-    total_users = await db.get_user_count()
-    total_drivers = await db.get_driver_count()
-    pending_registrations = await db.get_pending_registrations_count()
-
-    active_drivers = len(await db.get_active_drivers())
-    inactive_drivers = len(await db.get_inactive_drivers())
+    stats = await db.get_stats_snapshot()
 
     await message.answer(
         f"📊 Bot Statistics\n\n"
-        f"👥 Total Users: {total_users}\n"
-        f"🚗 Total Drivers: {total_drivers}\n"
-        f"📋 Pending Registrations: {pending_registrations}\n"
-        f"🟢 Active Drivers: {active_drivers}\n"
-        f"🔴 Inactive Drivers (7+ days): {inactive_drivers}"
+        f"👥 Total Users: {stats.total_users}\n"
+        f"🚗 Total Drivers: {stats.total_drivers}\n"
+        f"📋 Pending Registrations: {stats.pending_registrations}\n"
+        f"🟢 Active Drivers: {stats.active_drivers}\n"
+        f"🔴 Inactive Drivers (7+ days): {stats.inactive_drivers}"
     )
 
 @router.message(F.text.in_(["📋 Kutilayotgan arizalar", "📋 Ожидающие заявки"]))
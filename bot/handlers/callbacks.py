@@ -2,10 +2,13 @@ from aiogram import Router, F
 from aiogram.types import CallbackQuery, Message
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
+from typing import Optional
+import asyncio
 
+from config import settings
 from database import db
-from database.models import Driver, AdminAction
-from utils import get_message
+from database.models import User, Driver, AdminAction
+from utils import get_message, format_data_age
 from bot.keyboards import get_driver_main_menu, get_withdrawal_menu
 import logging
 
@@ -15,8 +18,6 @@ logger = logging.getLogger(__name__)
 class RejectionState(StatesGroup):
     waiting_for_reason = State()
 
-rejection_data = {}
-
 @router.callback_query(F.data.startswith("approve_"))
 async def process_approval(callback: CallbackQuery):
     admin_id = callback.from_user.id
@@ -69,10 +70,10 @@ async def process_rejection_start(callback: CallbackQuery, state: FSMContext):
     admin_id = callback.from_user.id
     telegram_id = int(callback.data.split("_")[1])
 
-    rejection_data[admin_id] = {
-        "telegram_id": telegram_id,
-        "message_id": callback.message.message_id
-    }
+    await state.update_data(
+        telegram_id=telegram_id,
+        message_id=callback.message.message_id
+    )
 
     await callback.message.reply(
         "Please reply to this message with the rejection reason:"
@@ -84,18 +85,17 @@ async def process_rejection_start(callback: CallbackQuery, state: FSMContext):
 async def process_rejection_reason(message: Message, state: FSMContext):
     admin_id = message.from_user.id
 
-    if admin_id not in rejection_data:
+    data = await state.get_data()
+    if "telegram_id" not in data:
         return
 
     reason = message.text
-    data = rejection_data[admin_id]
     telegram_id = data["telegram_id"]
 
     user = await db.get_user(telegram_id)
     if not user:
         await message.answer("User not found")
         await state.clear()
-        del rejection_data[admin_id]
         return
 
     await db.update_user(telegram_id, registration_status="rejected")
@@ -136,48 +136,46 @@ async def process_rejection_reason(message: Message, state: FSMContext):
 
     await message.answer("✅ Rejection sent to driver")
     await state.clear()
-    del rejection_data[admin_id]
 
 @router.callback_query(F.data == "refresh_balance")
-async def refresh_balance_callback(callback: CallbackQuery):
+async def refresh_balance_callback(callback: CallbackQuery, driver: Optional[Driver], lang: str):
     telegram_id = callback.from_user.id
-    user = await db.get_user(telegram_id)
-    lang = user.language if user else "uz"
 
-    driver = await db.get_driver(telegram_id)
     if not driver:
         await callback.answer(get_message("error_occurred", lang), show_alert=True)
         return
 
-    from services.yandex_api import sync_driver_data
+    from services.yandex_api import yandex_api, data_age
     try:
-        await sync_driver_data(telegram_id)
-        driver = await db.get_driver(telegram_id)
-        balance = driver.balance if driver else 0
+        task = yandex_api.revalidate_driver(driver, force=True)
+        refreshed = False
+        if task:
+            done, _ = await asyncio.wait({task}, timeout=settings.YANDEX_REFRESH_WAIT_SECONDS)
+            refreshed = bool(done) and task.result()
+        if refreshed:
+            driver = await db.get_driver(telegram_id) or driver
 
         await callback.message.edit_text(
-            get_message("withdrawal_menu", lang, balance=balance),
+            get_message("withdrawal_menu", lang, balance=driver.balance or 0)
+            + "\n\n" + format_data_age(data_age(driver), lang),
             reply_markup=get_withdrawal_menu(lang)
         )
-        await callback.answer("✅ Balance refreshed")
+        if refreshed:
+            await callback.answer("✅ Balance refreshed")
+        elif task:
+            await callback.answer(get_message("data_refreshing", lang))
+        else:
+            await callback.answer(get_message("yandex_unavailable", lang), show_alert=True)
     except Exception as e:
         logger.error(f"Error refreshing balance: {e}")
         await callback.answer(get_message("error_occurred", lang), show_alert=True)
 
 @router.callback_query(F.data == "withdraw_start")
-async def withdraw_start_callback(callback: CallbackQuery):
-    telegram_id = callback.from_user.id
-    user = await db.get_user(telegram_id)
-    lang = user.language if user else "uz"
-
+async def withdraw_start_callback(callback: CallbackQuery, lang: str):
     await callback.answer(get_message("withdrawal_not_implemented", lang), show_alert=True)
 
 @router.callback_query(F.data == "back_to_menu")
-async def back_to_menu_callback(callback: CallbackQuery):
-    telegram_id = callback.from_user.id
-    user = await db.get_user(telegram_id)
-    lang = user.language if user else "uz"
-
+async def back_to_menu_callback(callback: CallbackQuery, lang: str):
     await callback.message.delete()
     await callback.message.answer(
         get_message("main_menu", lang),
@@ -191,20 +189,15 @@ async def inactive_ok_callback(callback: CallbackQuery):
     await callback.answer()
 
 @router.callback_query(F.data == "inactive_problem")
-async def inactive_problem_callback(callback: CallbackQuery, state: FSMContext):
-    telegram_id = callback.from_user.id
-    user = await db.get_user(telegram_id)
-    lang = user.language if user else "uz"
-
+async def inactive_problem_callback(callback: CallbackQuery, state: FSMContext, lang: str):
     await callback.message.edit_text(get_message("inactive_problem", lang))
     await state.set_state("waiting_for_problem_description")
     await callback.answer()
 
 @router.message(F.text, F.state == "waiting_for_problem_description")
-async def process_problem_description(message: Message, state: FSMContext):
+async def process_problem_description(message: Message, state: FSMContext,
+                                      user: Optional[User], lang: str):
     telegram_id = message.from_user.id
-    user = await db.get_user(telegram_id)
-    lang = user.language if user else "uz"
 
     from aiogram import Bot
     from config import settings
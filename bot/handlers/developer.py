@@ -1,23 +1,29 @@
 from aiogram import Router, F
+from aiogram.filters import Command, CommandObject, MagicData
 from aiogram.types import Message, CallbackQuery, FSInputFile
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
 
 from database import db
 from utils import get_message
-from bot.keyboards import get_developer_panel_keyboard, get_settings_keyboard
-from datetime import datetime
+from bot.keyboards import get_developer_panel_keyboard, get_settings_keyboard, get_transactions_page_keyboard
+from datetime import datetime, timedelta, timezone
+import asyncio
 import logging
 import os
 
 router = Router()
+router.message.filter(MagicData(F.role == "developer"))
+router.callback_query.filter(MagicData(F.role == "developer"))
 logger = logging.getLogger(__name__)
 
 class DeveloperStates(StatesGroup):
     waiting_for_admin_id = State()
     waiting_for_setting_value = State()
 
-setting_context = {}
+TX_PAGE_SIZE = 10
+TX_STATUS_CODES = {"pending": "p", "completed": "c", "failed": "f"}
+TX_STATUS_NAMES = {code: status for status, code in TX_STATUS_CODES.items()}
 
 @router.message(F.text.in_(["👥 Adminlarni boshqarish", "👥 Управление админами"]))
 async def manage_admins(message: Message):
@@ -102,29 +108,28 @@ async def manage_settings(message: Message):
 
 @router.callback_query(F.data == "set_admin_group")
 async def set_admin_group(callback: CallbackQuery, state: FSMContext):
-    setting_context[callback.from_user.id] = "admin_group_id"
+    await state.update_data(setting_key="admin_group_id")
     await callback.message.answer("Send the Admin Group ID (e.g., -1001234567890):")
     await state.set_state(DeveloperStates.waiting_for_setting_value)
     await callback.answer()
 
 @router.callback_query(F.data == "set_info_channel")
 async def set_info_channel(callback: CallbackQuery, state: FSMContext):
-    setting_context[callback.from_user.id] = "info_channel_id"
+    await state.update_data(setting_key="info_channel_id")
     await callback.message.answer("Send the Info Channel ID (e.g., -1001234567890):")
     await state.set_state(DeveloperStates.waiting_for_setting_value)
     await callback.answer()
 
 @router.callback_query(F.data == "set_limits")
 async def set_limits(callback: CallbackQuery, state: FSMContext):
-    setting_context[callback.from_user.id] = "withdrawal_limit"
+    await state.update_data(setting_key="withdrawal_limit")
     await callback.message.answer("Send the withdrawal limit (e.g., 100000):")
     await state.set_state(DeveloperStates.waiting_for_setting_value)
     await callback.answer()
 
 @router.message(DeveloperStates.waiting_for_setting_value)
 async def process_setting_value(message: Message, state: FSMContext):
-    user_id = message.from_user.id
-    key = setting_context.get(user_id)
+    key = (await state.get_data()).get("setting_key")
 
     if not key:
         await state.clear()
@@ -138,7 +143,6 @@ async def process_setting_value(message: Message, state: FSMContext):
         reply_markup=get_developer_panel_keyboard()
     )
 
-    del setting_context[user_id]
     await state.clear()
 
 @router.callback_query(F.data == "back_to_dev_panel")
@@ -170,42 +174,216 @@ async def download_logs(message: Message):
 
 @router.message(F.text.in_(["💾 Backup yuklash", "💾 Скачать backup"]))
 async def download_backup(message: Message):
-    from config import settings
+    from services.backup import backup_engine
 
-    backup_file = f"backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.db"
+    if backup_engine.running:
+        await message.answer(f"⏳ A backup is already running ({backup_engine.get_progress_percent()}%).")
+        return
+
+    status = await message.answer("💾 Creating backup... 0%")
+    task = asyncio.create_task(backup_engine.create_backup())
+
+    percent = 0
+    while not task.done():
+        await asyncio.wait({task}, timeout=2)
+        if not task.done() and backup_engine.get_progress_percent() != percent:
+            percent = backup_engine.get_progress_percent()
+            try:
+                await status.edit_text(f"💾 Creating backup... {percent}%")
+            except Exception:
+                pass
 
     try:
-        await db.backup_database(backup_file)
+        result = task.result()
 
-        document = FSInputFile(backup_file)
+        await status.edit_text(f"💾 Backup ready in {result.duration:.1f}s, uploading...")
+        document = FSInputFile(result.path)
         await message.answer_document(
             document=document,
-            caption=f"💾 Database Backup - {datetime.now().strftime('%Y-%m-%d %H:%M')}"
+            caption=f"💾 Database Backup - {result.created_at.strftime('%Y-%m-%d %H:%M')}\n"
+                    f"Pages: {result.pages}, size: {result.size / 1024 / 1024:.1f} MB, "
+                    f"took {result.duration:.1f}s"
         )
-
-        os.remove(backup_file)
     except Exception as e:
         logger.error(f"Error creating backup: {e}")
         await message.answer(f"❌ Error creating backup: {e}")
 
-@router.message(F.text.in_(["💳 Tranzaksiyalar", "💳 Транзакции"]))
-async def view_transactions(message: Message):
-    transactions = await db.get_all_transactions()
+def encode_tx_callback(direction: str, tx, filters: dict) -> str:
+    return ":".join([
+        "tx", direction,
+        str(int(tx.created_at.timestamp())), str(tx.id),
+        TX_STATUS_CODES.get(filters.get("status"), "-"),
+        str(filters.get("telegram_id") or 0),
+        filters.get("date_from") or "-",
+        filters.get("date_to") or "-",
+    ])
+
+def decode_tx_callback(data: str):
+    _, direction, ts, tx_id, status, telegram_id, date_from, date_to = data.split(":")
+    filters = {
+        "status": TX_STATUS_NAMES.get(status),
+        "telegram_id": int(telegram_id) or None,
+        "date_from": None if date_from == "-" else date_from,
+        "date_to": None if date_to == "-" else date_to,
+    }
+    return direction, (int(ts), int(tx_id)), filters
+
+def parse_tx_filters(args: str) -> dict:
+    filters = {}
+    for arg in (args or "").split():
+        key, _, value = arg.partition("=")
+        if key == "status" and value in TX_STATUS_CODES:
+            filters["status"] = value
+        elif key == "driver" and value.isdigit():
+            filters["telegram_id"] = int(value)
+        elif key in ("from", "to"):
+            filters[f"date_{key}"] = datetime.strptime(value, "%Y-%m-%d").strftime("%Y%m%d")
+        else:
+            raise ValueError(arg)
+    return filters
+
+async def render_transactions_page(filters: dict, after=None, before=None):
+    date_from = date_to = None
+    if filters.get("date_from"):
+        date_from = datetime.strptime(filters["date_from"], "%Y%m%d").replace(tzinfo=timezone.utc)
+    if filters.get("date_to"):
+        date_to = datetime.strptime(filters["date_to"], "%Y%m%d").replace(tzinfo=timezone.utc) + timedelta(days=1)
+
+    transactions = await db.get_transactions_page(
+        limit=TX_PAGE_SIZE + 1,
+        after=after,
+        before=before,
+        status=filters.get("status"),
+        telegram_id=filters.get("telegram_id"),
+        date_from=date_from,
+        date_to=date_to
+    )
+
+    if before:
+        has_newer = len(transactions) > TX_PAGE_SIZE
+        has_older = True
+        transactions = transactions[-TX_PAGE_SIZE:]
+    else:
+        has_newer = after is not None
+        has_older = len(transactions) > TX_PAGE_SIZE
+        transactions = transactions[:TX_PAGE_SIZE]
 
     if not transactions:
-        await message.answer("📝 No transactions found.")
-        return
+        return "📝 No transactions found.", None
 
     text = "💳 Recent Transactions:\n\n"
-    for i, tx in enumerate(transactions[:20], 1):
+    if not filters and not after and not before:
+        totals = await db.get_transaction_totals()
+        for status, (count, amount) in sorted(totals.items()):
+            text += f"Σ {status}: {count} / {amount:,.2f}\n"
+        if totals:
+            text += "\n"
+    for tx in transactions:
         status_emoji = "✅" if tx.status == "completed" else "⏳" if tx.status == "pending" else "❌"
-        text += (f"{i}. {status_emoji} ID: {tx.id}\n"
+        text += (f"{status_emoji} ID: {tx.id}\n"
                 f"   Driver: {tx.telegram_id}\n"
                 f"   Amount: {tx.amount:,.2f}\n"
                 f"   Status: {tx.status}\n"
-                f"   Date: {tx.created_at}\n\n")
+                f"   Date: {tx.created_at:%Y-%m-%d %H:%M:%S}\n\n")
 
-    await message.answer(text)
+    keyboard = get_transactions_page_keyboard(
+        prev_data=encode_tx_callback("p", transactions[0], filters) if has_newer else None,
+        next_data=encode_tx_callback("n", transactions[-1], filters) if has_older else None
+    )
+    return text, keyboard
+
+@router.message(F.text.in_(["💳 Tranzaksiyalar", "💳 Транзакции"]))
+async def view_transactions(message: Message):
+    text, keyboard = await render_transactions_page({})
+    await message.answer(text, reply_markup=keyboard)
+
+@router.message(Command("transactions"))
+async def filter_transactions(message: Message, command: CommandObject):
+    try:
+        filters = parse_tx_filters(command.args)
+    except ValueError:
+        await message.answer(
+            "Usage: /transactions [status=pending|completed|failed] [driver=<telegram_id>] "
+            "[from=YYYY-MM-DD] [to=YYYY-MM-DD]"
+        )
+        return
+
+    text, keyboard = await render_transactions_page(filters)
+    await message.answer(text, reply_markup=keyboard)
+
+@router.callback_query(F.data.startswith("tx:"))
+async def paginate_transactions(callback: CallbackQuery):
+    direction, cursor, filters = decode_tx_callback(callback.data)
+
+    if direction == "p":
+        text, keyboard = await render_transactions_page(filters, before=cursor)
+    else:
+        text, keyboard = await render_transactions_page(filters, after=cursor)
+
+    await callback.message.edit_text(text, reply_markup=keyboard)
+    await callback.answer()
+
+@router.message(F.text.in_(["🩺 Tizim holati", "🩺 Состояние системы"]))
+async def show_system_stats(message: Message):
+    write_stats = db.get_write_stats()
+    batch_sizes = ", ".join(f"{size}×{count}" for size, count in write_stats["batch_sizes"].items()) or "—"
+
+    from services.backup import backup_engine
+    from services.refresh_planner import refresh_planner
+    from services.yandex_api import yandex_api
+
+    http_stats = yandex_api.get_connection_stats()
+    refresh_stats = yandex_api.get_refresh_stats()
+    breaker_stats = yandex_api.circuit_breaker.as_dict()
+    tier_text = "\n".join(
+        f"{name}: every {interval // 60} min" for name, interval in refresh_planner.get_tier_intervals()
+    ) + f"\nDue now: {await refresh_planner.count_due()}"
+    cycle = refresh_planner.last_cycle
+    if cycle:
+        cycle_text = (f"{cycle.started_at.strftime('%H:%M:%S')}: {cycle.planned} drivers, "
+                      f"{cycle.requests}/{refresh_planner.request_budget} requests, "
+                      f"{cycle.updated} changed, {cycle.duration:.1f}s")
+    else:
+        cycle_text = "None since start"
+    rate_text = "\n".join(
+        f"{endpoint}: {stats['rate']}/{stats['max_rate']} rps, "
+        f"{stats['throttles']} throttled, {stats['waits']} waits"
+        for endpoint, stats in yandex_api.get_rate_limit_stats().items()
+    ) or "No requests yet"
+
+    last_backup = backup_engine.last_result
+    if backup_engine.running:
+        backup_text = f"Running: {backup_engine.get_progress_percent()}%"
+    elif last_backup:
+        backup_text = (f"{last_backup.created_at.strftime('%Y-%m-%d %H:%M')}, "
+                       f"{last_backup.size / 1024 / 1024:.1f} MB, took {last_backup.duration:.1f}s")
+    else:
+        backup_text = "None since start"
+
+    await message.answer(
+        f"🩺 System Stats\n\n"
+        f"💾 Database writes\n"
+        f"Group commit: {'on' if write_stats['group_commit'] else 'off'}\n"
+        f"Commits: {write_stats['commits']}\n"
+        f"Statements: {write_stats['statements']}\n"
+        f"Statements per commit: avg {write_stats['avg_statements_per_commit']}, "
+        f"max {write_stats['max_statements_per_commit']}, "
+        f"last {write_stats['last_statements_per_commit']}\n"
+        f"Batch sizes: {batch_sizes}\n\n"
+        f"🌐 Yandex HTTP pool\n"
+        f"Requests: {http_stats['requests']}\n"
+        f"Connections: {http_stats['connections_created']} opened, "
+        f"{http_stats['connections_reused']} reused (ratio {http_stats['reuse_ratio']})\n"
+        f"DNS cache: {http_stats['dns_cache_hits']} hits, {http_stats['dns_cache_misses']} misses\n\n"
+        f"🚦 Yandex rate limits\n{rate_text}\n\n"
+        f"🔌 Yandex circuit: {breaker_stats['state']}, {breaker_stats['trips']} trips, "
+        f"{breaker_stats['rejected']} rejected\n\n"
+        f"⏱ Refresh tiers\n{tier_text}\nLast cycle: {cycle_text}\n\n"
+        f"🔄 Driver refreshes\n"
+        f"Requests: {refresh_stats['requests']}, fetched {refresh_stats['fetched']}\n"
+        f"Cache hits: {refresh_stats['cache_hits']}, coalesced: {refresh_stats['coalesced']}\n\n"
+        f"🗄 Last backup\n{backup_text}"
+    )
 
 @router.message(F.text == "🔙 Back")
 async def back_to_panel(message: Message):
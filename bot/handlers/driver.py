@@ -1,27 +1,35 @@
 from aiogram import Router, F
 from aiogram.types import Message
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+import asyncio
 
+from config import settings
 from database import db
-from utils import get_message
+from database.models import User, Driver
+from utils import get_message, format_data_age
 from bot.keyboards import get_driver_main_menu, get_language_keyboard, get_withdrawal_menu
 import logging
 
 router = Router()
 logger = logging.getLogger(__name__)
 
-@router.message(F.text.in_(["👤 Mening profilim", "👤 Мой профиль"]))
-async def show_profile(message: Message):
-    telegram_id = message.from_user.id
-    user = await db.get_user(telegram_id)
-    lang = user.language if user else "uz"
-
-    driver = await db.get_driver(telegram_id)
+def format_balance(driver: Driver, lang: str) -> str:
+    last_trip_date = driver.last_trip_date.strftime("%Y-%m-%d %H:%M") if driver.last_trip_date else "N/A"
+    return get_message("balance_info", lang,
+                       balance=f"{driver.balance or 0:,.2f}",
+                       last_trip_date=last_trip_date,
+                       last_trip_sum=f"{driver.last_trip_sum or 0:,.2f}")
 
+@router.message(F.text.in_(["👤 Mening profilim", "👤 Мой профиль"]))
+async def show_profile(message: Message, user: Optional[User], driver: Optional[Driver], lang: str):
     if not driver:
         await message.answer(get_message("error_occurred", lang))
         return
 
+    from services.yandex_api import yandex_api, data_age
+    yandex_api.revalidate_driver(driver)
+
     phone = user.phone or "N/A"
     callsign = driver.callsign or "N/A"
     car_model = driver.car_model or "N/A"
@@ -33,39 +41,22 @@ async def show_profile(message: Message):
                    callsign=callsign,
                    car_model=car_model,
                    balance=f"{balance:,.2f}")
+        + "\n\n" + format_data_age(data_age(driver), lang)
     )
 
 @router.message(F.text.in_(["💰 Mening balansi", "💰 Мой баланс"]))
-async def show_balance(message: Message):
-    telegram_id = message.from_user.id
-    user = await db.get_user(telegram_id)
-    lang = user.language if user else "uz"
-
-    driver = await db.get_driver(telegram_id)
-
+async def show_balance(message: Message, driver: Optional[Driver], lang: str):
     if not driver:
         await message.answer(get_message("error_occurred", lang))
         return
 
-    balance = driver.balance or 0
-    last_trip_date = driver.last_trip_date.strftime("%Y-%m-%d %H:%M") if driver.last_trip_date else "N/A"
-    last_trip_sum = driver.last_trip_sum or 0
+    from services.yandex_api import yandex_api, data_age
+    yandex_api.revalidate_driver(driver)
 
-    await message.answer(
-        get_message("balance_info", lang,
-                   balance=f"{balance:,.2f}",
-                   last_trip_date=last_trip_date,
-                   last_trip_sum=f"{last_trip_sum:,.2f}")
-    )
+    await message.answer(format_balance(driver, lang) + "\n\n" + format_data_age(data_age(driver), lang))
 
 @router.message(F.text.in_(["📊 Mening statistikam", "📊 Моя статистика"]))
-async def show_stats(message: Message):
-    telegram_id = message.from_user.id
-    user = await db.get_user(telegram_id)
-    lang = user.language if user else "uz"
-
-    driver = await db.get_driver(telegram_id)
-
+async def show_stats(message: Message, driver: Optional[Driver], lang: str):
     if not driver:
         await message.answer(get_message("error_occurred", lang))
         return
@@ -82,57 +73,61 @@ async def show_stats(message: Message):
     )
 
 @router.message(F.text.in_(["🔄 Ma'lumotlarni yangilash", "🔄 Обновить данные"]))
-async def update_info(message: Message):
-    telegram_id = message.from_user.id
-    user = await db.get_user(telegram_id)
-    lang = user.language if user else "uz"
-
-    driver = await db.get_driver(telegram_id)
-
+async def update_info(message: Message, driver: Optional[Driver], lang: str):
     if not driver:
         await message.answer(get_message("error_occurred", lang))
         return
 
     if driver.last_manual_sync:
-        time_diff = datetime.now() - driver.last_manual_sync
+        time_diff = datetime.now(timezone.utc) - driver.last_manual_sync
         if time_diff < timedelta(hours=1):
             await message.answer(get_message("update_info_limit", lang))
             return
 
+    if not driver.yandex_driver_id:
+        await message.answer(get_message("update_info_error", lang))
+        return
+
     await message.answer(get_message("update_info_started", lang))
 
-    from services.yandex_api import sync_driver_data
+    from services.yandex_api import yandex_api, data_age
     try:
-        await sync_driver_data(telegram_id)
-        await message.answer(get_message("update_info_success", lang))
+        task = yandex_api.revalidate_driver(driver, force=True, manual=True)
+        if task:
+            done, _ = await asyncio.wait({task}, timeout=settings.YANDEX_REFRESH_WAIT_SECONDS)
+            if done:
+                success = task.result()
+                await message.answer(get_message("update_info_success" if success else "update_info_error", lang))
+                return
+
+        note = get_message("data_refreshing" if task else "yandex_unavailable", lang)
+        await message.answer(
+            format_balance(driver, lang) + "\n\n" + format_data_age(data_age(driver), lang) + "\n" + note
+        )
     except Exception as e:
         logger.error(f"Error updating driver data: {e}")
         await message.answer(get_message("update_info_error", lang))
 
 @router.message(F.text.in_(["💸 Pulni yechish", "💸 Вывести деньги"]))
-async def withdraw_money(message: Message):
-    telegram_id = message.from_user.id
-    user = await db.get_user(telegram_id)
-    lang = user.language if user else "uz"
-
-    driver = await db.get_driver(telegram_id)
-
+async def withdraw_money(message: Message, driver: Optional[Driver], lang: str):
     if not driver:
         await message.answer(get_message("error_occurred", lang))
         return
 
+    from services.yandex_api import yandex_api, data_age
+    yandex_api.revalidate_driver(driver)
+
     balance = driver.balance or 0
 
     await message.answer(
-        get_message("withdrawal_menu", lang, balance=f"{balance:,.2f}"),
+        get_message("withdrawal_menu", lang, balance=f"{balance:,.2f}")
+        + "\n\n" + format_data_age(data_age(driver), lang),
         reply_markup=get_withdrawal_menu(lang)
     )
 
 @router.message(F.text.in_(["📖 Yo'riqnoma", "📖 Инструкции"]))
-async def show_instructions(message: Message):
+async def show_instructions(message: Message, lang: str):
     telegram_id = message.from_user.id
-    user = await db.get_user(telegram_id)
-    lang = user.language if user else "uz"
 
     info_channel_id = await db.get_setting("info_channel_id")
 
@@ -161,10 +156,8 @@ async def show_instructions(message: Message):
         await message.answer(get_message("error_occurred", lang))
 
 @router.message(F.text.in_(["📞 Adminlar bilan bog'lanish", "📞 Связаться с админами"]))
-async def contact_admins(message: Message):
+async def contact_admins(message: Message, user: Optional[User], driver: Optional[Driver], lang: str):
     telegram_id = message.from_user.id
-    user = await db.get_user(telegram_id)
-    lang = user.language if user else "uz"
 
     admin_group_id = await db.get_setting("admin_group_id")
 
@@ -176,7 +169,6 @@ async def contact_admins(message: Message):
     from config import settings
     bot = Bot(token=settings.BOT_TOKEN)
 
-    driver = await db.get_driver(telegram_id)
     name = driver.name if driver else message.from_user.first_name
 
     try:
@@ -194,11 +186,7 @@ async def contact_admins(message: Message):
         await message.answer(get_message("error_occurred", lang))
 
 @router.message(F.text.in_(["⚙️ Sozlamalar", "⚙️ Настройки"]))
-async def show_settings(message: Message):
-    telegram_id = message.from_user.id
-    user = await db.get_user(telegram_id)
-    lang = user.language if user else "uz"
-
+async def show_settings(message: Message, lang: str):
     await message.answer(
         get_message("language_menu", lang),
         reply_markup=get_language_keyboard()
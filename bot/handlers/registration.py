@@ -1,9 +1,10 @@
 from aiogram import Router, F
 from aiogram.types import Message, CallbackQuery
 from aiogram.fsm.context import FSMContext
+from typing import Optional
 
 from database import db
-from database.models import User, Document
+from database.models import User, Driver, Document
 from utils import get_message
 from bot.states import RegistrationStates
 from bot.keyboards import get_share_contact_keyboard, get_start_registration_keyboard
@@ -13,12 +14,10 @@ router = Router()
 logger = logging.getLogger(__name__)
 
 @router.callback_query(F.data.startswith("lang_"))
-async def process_language_selection(callback: CallbackQuery, state: FSMContext):
+async def process_language_selection(callback: CallbackQuery, state: FSMContext, user: Optional[User]):
     lang = callback.data.split("_")[1]
     telegram_id = callback.from_user.id
 
-    user = await db.get_user(telegram_id)
-
     if not user:
         user = User(telegram_id=telegram_id, language=lang)
         await db.create_user(user)
@@ -33,14 +32,14 @@ async def process_language_selection(callback: CallbackQuery, state: FSMContext)
     await callback.answer()
 
 @router.message(F.contact)
-async def process_contact(message: Message, state: FSMContext):
+async def process_contact(message: Message, state: FSMContext,
+                          user: Optional[User], driver: Optional[Driver]):
     if message.contact.user_id != message.from_user.id:
         return
 
     telegram_id = message.from_user.id
     phone = message.contact.phone_number
 
-    user = await db.get_user(telegram_id)
     if not user:
         user = User(telegram_id=telegram_id, phone=phone)
         await db.create_user(user)
@@ -51,7 +50,6 @@ async def process_contact(message: Message, state: FSMContext):
 
     if user and user.registration_status == "approved":
         from bot.keyboards import get_driver_main_menu
-        driver = await db.get_driver(telegram_id)
         name = driver.name if driver else message.from_user.first_name
         await message.answer(
             get_message("welcome_driver", lang, name=name),
@@ -67,9 +65,8 @@ async def process_contact(message: Message, state: FSMContext):
     "📝 Ro'yxatdan o'tish",
     "📝 Начать регистрацию"
 ]))
-async def start_registration(message: Message, state: FSMContext):
+async def start_registration(message: Message, state: FSMContext, user: Optional[User]):
     telegram_id = message.from_user.id
-    user = await db.get_user(telegram_id)
 
     if not user:
         return
@@ -87,32 +84,30 @@ async def start_registration(message: Message, state: FSMContext):
     await message.answer(get_message("send_driver_license_front", lang))
 
 @router.message(RegistrationStates.waiting_for_driver_license_front)
-async def process_driver_license_front(message: Message, state: FSMContext):
-    await process_document(message, state, "driver_license_front",
+async def process_driver_license_front(message: Message, state: FSMContext, user: Optional[User], lang: str):
+    await process_document(message, state, user, lang, "driver_license_front",
                           RegistrationStates.waiting_for_driver_license_back,
                           "send_driver_license_back")
 
 @router.message(RegistrationStates.waiting_for_driver_license_back)
-async def process_driver_license_back(message: Message, state: FSMContext):
-    await process_document(message, state, "driver_license_back",
+async def process_driver_license_back(message: Message, state: FSMContext, user: Optional[User], lang: str):
+    await process_document(message, state, user, lang, "driver_license_back",
                           RegistrationStates.waiting_for_tech_passport_front,
                           "send_tech_passport_front")
 
 @router.message(RegistrationStates.waiting_for_tech_passport_front)
-async def process_tech_passport_front(message: Message, state: FSMContext):
-    await process_document(message, state, "tech_passport_front",
+async def process_tech_passport_front(message: Message, state: FSMContext, user: Optional[User], lang: str):
+    await process_document(message, state, user, lang, "tech_passport_front",
                           RegistrationStates.waiting_for_tech_passport_back,
                           "send_tech_passport_back")
 
 @router.message(RegistrationStates.waiting_for_tech_passport_back)
-async def process_tech_passport_back(message: Message, state: FSMContext):
-    await process_document(message, state, "tech_passport_back", None, None, is_last=True)
+async def process_tech_passport_back(message: Message, state: FSMContext, user: Optional[User], lang: str):
+    await process_document(message, state, user, lang, "tech_passport_back", None, None, is_last=True)
 
-async def process_document(message: Message, state: FSMContext, doc_type: str,
-                          next_state, next_message_key: str, is_last: bool = False):
+async def process_document(message: Message, state: FSMContext, user: Optional[User], lang: str,
+                          doc_type: str, next_state, next_message_key: str, is_last: bool = False):
     telegram_id = message.from_user.id
-    user = await db.get_user(telegram_id)
-    lang = user.language if user else "uz"
 
     if not message.photo:
         await message.answer(get_message("document_invalid", lang))
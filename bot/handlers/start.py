@@ -2,10 +2,10 @@ from aiogram import Router, F
 from aiogram.filters import CommandStart
 from aiogram.types import Message
 from aiogram.fsm.context import FSMContext
+from typing import Optional
 
 from database import db
-from database.models import User
-from config import settings
+from database.models import User, Driver
 from utils import get_message
 from bot.keyboards import (
     get_language_keyboard,
@@ -16,24 +16,12 @@ from bot.keyboards import (
 
 router = Router()
 
-async def determine_role(telegram_id: int) -> str:
-    if telegram_id in settings.DEVELOPER_IDS:
-        return "developer"
-
-    admin_ids = await db.get_admin_ids()
-    if telegram_id in admin_ids:
-        return "admin"
-
-    return "driver"
-
 @router.message(CommandStart())
-async def cmd_start(message: Message, state: FSMContext):
+async def cmd_start(message: Message, state: FSMContext,
+                    user: Optional[User], driver: Optional[Driver], role: str):
     await state.clear()
 
     telegram_id = message.from_user.id
-    role = await determine_role(telegram_id)
-
-    user = await db.get_user(telegram_id)
 
     if not user:
         if role == "developer":
@@ -87,7 +75,6 @@ async def cmd_start(message: Message, state: FSMContext):
         )
     else:
         if user.registration_status == "approved":
-            driver = await db.get_driver(telegram_id)
             name = driver.name if driver else message.from_user.first_name
             await message.answer(
                 get_message("welcome_driver", lang, name=name),
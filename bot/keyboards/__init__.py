@@ -8,4 +8,4 @@ from .driver_kb import (
     get_back_keyboard
 )
 from .admin_kb import get_admin_panel_keyboard, get_approval_keyboard
-from .developer_kb import get_developer_panel_keyboard, get_settings_keyboard
+from .developer_kb import get_developer_panel_keyboard, get_settings_keyboard, get_transactions_page_keyboard
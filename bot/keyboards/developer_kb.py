@@ -1,3 +1,4 @@
+from typing import Optional
 from aiogram.types import ReplyKeyboardMarkup, KeyboardButton, InlineKeyboardMarkup, InlineKeyboardButton
 from utils import get_message
 
@@ -15,6 +16,9 @@ def get_developer_panel_keyboard(lang: str = "ru") -> ReplyKeyboardMarkup:
             [
                 KeyboardButton(text=get_message("view_transactions", lang)),
                 KeyboardButton(text=get_message("statistics", lang))
+            ],
+            [
+                KeyboardButton(text=get_message("system_stats", lang))
             ]
         ],
         resize_keyboard=True
@@ -29,3 +33,15 @@ def get_settings_keyboard() -> InlineKeyboardMarkup:
         [InlineKeyboardButton(text="🔙 Back", callback_data="back_to_dev_panel")]
     ])
     return keyboard
+
+def get_transactions_page_keyboard(prev_data: Optional[str] = None,
+                                   next_data: Optional[str] = None) -> Optional[InlineKeyboardMarkup]:
+    buttons = []
+    if prev_data:
+        buttons.append(InlineKeyboardButton(text="⬅️ Newer", callback_data=prev_data))
+    if next_data:
+        buttons.append(InlineKeyboardButton(text="Older ➡️", callback_data=next_data))
+
+    if not buttons:
+        return None
+    return InlineKeyboardMarkup(inline_keyboard=[buttons])
@@ -1 +1,6 @@
-# Middlewares placeholder
+from .user_context import UserContextMiddleware, last_seen_buffer
+
+def register_all_middlewares(dp):
+    user_context = UserContextMiddleware()
+    dp.message.outer_middleware(user_context)
+    dp.callback_query.outer_middleware(user_context)
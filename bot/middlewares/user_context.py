@@ -0,0 +1,95 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+
+from config import settings
+from database import db
+
+logger = logging.getLogger(__name__)
+
+def determine_role(telegram_id: int) -> str:
+    if telegram_id in settings.DEVELOPER_IDS:
+        return "developer"
+
+    if db.is_admin(telegram_id):
+        return "admin"
+
+    return "driver"
+
+class LastSeenBuffer:
+    def __init__(self, flush_interval_ms: int = 5000):
+        self.flush_interval = flush_interval_ms / 1000
+        self._pending = set()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flushes = set()
+
+    def add(self, telegram_id: int):
+        self._pending.add(telegram_id)
+        if self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.flush_interval, self._start_flush)
+
+    def _start_flush(self):
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+
+        if not self._pending:
+            return
+
+        task = asyncio.create_task(self._flush())
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self):
+        pending, self._pending = self._pending, set()
+        try:
+            await db.touch_drivers_seen(list(pending))
+        except Exception as e:
+            # Last seen only steers refresh priority, so a lost batch is not worth retrying.
+            logger.error(f"Error flushing last seen for {len(pending)} drivers: {e}")
+            return
+        logger.debug(f"Flushed last seen for {len(pending)} drivers")
+
+    async def close(self):
+        self._start_flush()
+        while self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+
+last_seen_buffer = LastSeenBuffer(settings.LAST_SEEN_FLUSH_INTERVAL_MS)
+
+def touch_last_seen(driver):
+    now = datetime.now(timezone.utc)
+    if driver.last_seen_at and (now - driver.last_seen_at).total_seconds() < settings.LAST_SEEN_RESOLUTION_SECONDS:
+        return
+
+    # The driver object is shared with the context cache, so this also throttles later updates.
+    driver.last_seen_at = now
+    last_seen_buffer.add(driver.telegram_id)
+
+class UserContextMiddleware(BaseMiddleware):
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any]
+    ) -> Any:
+        from_user = data.get("event_from_user")
+
+        user = driver = None
+        role = "driver"
+        if from_user:
+            user, driver = await db.get_user_context(from_user.id)
+            role = determine_role(from_user.id)
+            if driver:
+                touch_last_seen(driver)
+
+        data["user"] = user
+        data["driver"] = driver
+        data["lang"] = user.language if user else "uz"
+        data["role"] = role
+
+        return await handler(event, data)
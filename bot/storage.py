@@ -0,0 +1,122 @@
+import asyncio
+import json
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, StateType, StorageKey
+
+from database import db
+
+logger = logging.getLogger(__name__)
+
+class SQLiteStorage(BaseStorage):
+    def __init__(self, flush_interval_ms: int = 1000, cache_size: int = 10000):
+        self.flush_interval = flush_interval_ms / 1000
+        self.cache_size = cache_size
+        self._records: OrderedDict = OrderedDict()
+        self._dirty = set()
+        self._writing = set()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flushes = set()
+
+    @staticmethod
+    def _key(key: StorageKey) -> str:
+        return f"{key.bot_id}:{key.chat_id}:{key.user_id}:{key.thread_id or ''}:{key.destiny}"
+
+    async def _load(self, key: StorageKey) -> list:
+        storage_key = self._key(key)
+        record = self._records.get(storage_key)
+        if record is not None:
+            self._records.move_to_end(storage_key)
+            return record
+
+        row = await db.get_fsm_record(storage_key)
+
+        record = self._records.get(storage_key)
+        if record is None:
+            record = [row[0], json.loads(row[1])] if row else [None, {}]
+            self._records[storage_key] = record
+            self._evict(keep=storage_key)
+        return record
+
+    def _mark_dirty(self, key: StorageKey):
+        self._dirty.add(self._key(key))
+        if self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.flush_interval, self._start_flush)
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        record = await self._load(key)
+        record[0] = state.state if isinstance(state, State) else state
+        self._mark_dirty(key)
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        record = await self._load(key)
+        return record[0]
+
+    async def set_data(self, key: StorageKey, data: Dict[str, Any]) -> None:
+        record = await self._load(key)
+        record[1] = data.copy()
+        self._mark_dirty(key)
+
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        record = await self._load(key)
+        return record[1].copy()
+
+    def _start_flush(self):
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+
+        if not self._dirty:
+            return
+
+        task = asyncio.create_task(self._flush())
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self):
+        dirty, self._dirty = self._dirty, set()
+        self._writing |= dirty
+
+        records = []
+        for storage_key in dirty:
+            state, data = self._records[storage_key]
+            if state is None and not data:
+                records.append((storage_key, None, None))
+            else:
+                records.append((storage_key, state, json.dumps(data, ensure_ascii=False)))
+
+        try:
+            await db.save_fsm_records(records)
+        except Exception as e:
+            self._writing -= dirty
+            logger.error(f"Error flushing {len(records)} FSM records: {e}")
+            self._dirty |= dirty
+            if self._timer is None:
+                self._timer = asyncio.get_running_loop().call_later(self.flush_interval, self._start_flush)
+            return
+
+        self._writing -= dirty
+        logger.debug(f"Flushed {len(records)} FSM records")
+        self._evict()
+
+    def _evict(self, keep: Optional[str] = None):
+        excess = len(self._records) - self.cache_size
+        if excess <= 0:
+            return
+
+        victims = []
+        for storage_key in self._records:
+            if len(victims) >= excess:
+                break
+            if storage_key != keep and storage_key not in self._dirty and storage_key not in self._writing:
+                victims.append(storage_key)
+        for storage_key in victims:
+            del self._records[storage_key]
+
+    async def close(self) -> None:
+        self._start_flush()
+        while self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
@@ -13,12 +13,64 @@ class Settings:
     ]
 
     DATABASE_PATH: str = os.getenv("DATABASE_PATH", "taxi_bot.db")
+    DATABASE_WAL_MODE: bool = os.getenv("DATABASE_WAL_MODE", "false").lower() in ("1", "true", "yes")
+    DATABASE_READ_POOL_SIZE: int = int(os.getenv("DATABASE_READ_POOL_SIZE", "4"))
+    DATABASE_BUSY_TIMEOUT_MS: int = int(os.getenv("DATABASE_BUSY_TIMEOUT_MS", "5000"))
+    DATABASE_CACHE_SIZE_KB: int = int(os.getenv("DATABASE_CACHE_SIZE_KB", "16384"))
+    DATABASE_GROUP_COMMIT: bool = os.getenv("DATABASE_GROUP_COMMIT", "false").lower() in ("1", "true", "yes")
+    DATABASE_GROUP_COMMIT_MAX_STATEMENTS: int = int(os.getenv("DATABASE_GROUP_COMMIT_MAX_STATEMENTS", "64"))
+    DATABASE_GROUP_COMMIT_MAX_DELAY_MS: int = int(os.getenv("DATABASE_GROUP_COMMIT_MAX_DELAY_MS", "10"))
+    USER_CONTEXT_CACHE_SIZE: int = int(os.getenv("USER_CONTEXT_CACHE_SIZE", "10000"))
+    USER_CONTEXT_CACHE_TTL: float = float(os.getenv("USER_CONTEXT_CACHE_TTL", "60"))
+    FSM_FLUSH_INTERVAL_MS: int = int(os.getenv("FSM_FLUSH_INTERVAL_MS", "1000"))
+    FSM_CACHE_SIZE: int = int(os.getenv("FSM_CACHE_SIZE", "10000"))
+
+    BACKUP_DIR: str = os.getenv("BACKUP_DIR", "backups")
+    BACKUP_RETENTION: int = int(os.getenv("BACKUP_RETENTION", "7"))
+    BACKUP_COMPRESSION: str = os.getenv("BACKUP_COMPRESSION", "gzip").lower()
+    BACKUP_PAGES_PER_STEP: int = int(os.getenv("BACKUP_PAGES_PER_STEP", "1024"))
+    BACKUP_STEP_SLEEP_MS: int = int(os.getenv("BACKUP_STEP_SLEEP_MS", "5"))
+    BACKUP_MAX_RESTARTS: int = int(os.getenv("BACKUP_MAX_RESTARTS", "3"))
+    BACKUP_SCHEDULE_HOUR: int = int(os.getenv("BACKUP_SCHEDULE_HOUR", "3"))
+
+    ARCHIVE_DATABASE_PATH: str = os.getenv("ARCHIVE_DATABASE_PATH", "taxi_bot_archive.db")
+    TRANSACTIONS_RETENTION_DAYS: int = int(os.getenv("TRANSACTIONS_RETENTION_DAYS", "90"))
+    ADMIN_ACTIONS_RETENTION_DAYS: int = int(os.getenv("ADMIN_ACTIONS_RETENTION_DAYS", "90"))
+    RETENTION_BATCH_SIZE: int = int(os.getenv("RETENTION_BATCH_SIZE", "1000"))
+    RETENTION_SCHEDULE_HOUR: int = int(os.getenv("RETENTION_SCHEDULE_HOUR", "4"))
 
     YANDEX_API_URL: str = os.getenv("YANDEX_API_URL", "")
     YANDEX_PARK_ID: str = os.getenv("YANDEX_PARK_ID", "")
     YANDEX_CLIENT_ID: str = os.getenv("YANDEX_CLIENT_ID", "")
     YANDEX_API_KEY: str = os.getenv("YANDEX_API_KEY", "")
     YANDEX_API_SECRET: str = os.getenv("YANDEX_API_SECRET", "")
+    YANDEX_HTTP_POOL_SIZE: int = int(os.getenv("YANDEX_HTTP_POOL_SIZE", "100"))
+    YANDEX_HTTP_POOL_SIZE_PER_HOST: int = int(os.getenv("YANDEX_HTTP_POOL_SIZE_PER_HOST", "20"))
+    YANDEX_HTTP_KEEPALIVE_TIMEOUT: float = float(os.getenv("YANDEX_HTTP_KEEPALIVE_TIMEOUT", "60"))
+    YANDEX_HTTP_DNS_CACHE_TTL: int = int(os.getenv("YANDEX_HTTP_DNS_CACHE_TTL", "300"))
+    YANDEX_SYNC_BATCH_SIZE: int = int(os.getenv("YANDEX_SYNC_BATCH_SIZE", "500"))
+    YANDEX_FETCH_CONCURRENCY: int = int(os.getenv("YANDEX_FETCH_CONCURRENCY", "4"))
+    YANDEX_PAGE_QUEUE_SIZE: int = int(os.getenv("YANDEX_PAGE_QUEUE_SIZE", "4"))
+    YANDEX_WATERMARK_OVERLAP_SECONDS: int = int(os.getenv("YANDEX_WATERMARK_OVERLAP_SECONDS", "300"))
+    YANDEX_REFRESH_CACHE_TTL: float = float(os.getenv("YANDEX_REFRESH_CACHE_TTL", "30"))
+    YANDEX_REFRESH_CACHE_SIZE: int = int(os.getenv("YANDEX_REFRESH_CACHE_SIZE", "10000"))
+    YANDEX_STALE_AFTER_SECONDS: int = int(os.getenv("YANDEX_STALE_AFTER_SECONDS", "300"))
+    YANDEX_REFRESH_WAIT_SECONDS: float = float(os.getenv("YANDEX_REFRESH_WAIT_SECONDS", "0.8"))
+    YANDEX_BREAKER_FAILURES: int = int(os.getenv("YANDEX_BREAKER_FAILURES", "5"))
+    YANDEX_BREAKER_RESET_SECONDS: float = float(os.getenv("YANDEX_BREAKER_RESET_SECONDS", "30"))
+
+    REFRESH_CYCLE_SECONDS: int = int(os.getenv("REFRESH_CYCLE_SECONDS", "60"))
+    REFRESH_REQUEST_BUDGET: int = int(os.getenv("REFRESH_REQUEST_BUDGET", "4"))
+    REFRESH_TIERS: str = os.getenv("REFRESH_TIERS", "1:300,7:3600,30:86400")
+    REFRESH_DORMANT_INTERVAL: int = int(os.getenv("REFRESH_DORMANT_INTERVAL", "604800"))
+    LAST_SEEN_RESOLUTION_SECONDS: int = int(os.getenv("LAST_SEEN_RESOLUTION_SECONDS", "300"))
+    LAST_SEEN_FLUSH_INTERVAL_MS: int = int(os.getenv("LAST_SEEN_FLUSH_INTERVAL_MS", "5000"))
+    YANDEX_RATE_LIMIT: float = float(os.getenv("YANDEX_RATE_LIMIT", "5"))
+    YANDEX_RATE_LIMITS: str = os.getenv("YANDEX_RATE_LIMITS", "")
+    YANDEX_RATE_BURST: int = int(os.getenv("YANDEX_RATE_BURST", "5"))
+    YANDEX_RATE_MIN: float = float(os.getenv("YANDEX_RATE_MIN", "0.5"))
+    YANDEX_RATE_INCREASE: float = float(os.getenv("YANDEX_RATE_INCREASE", "0.1"))
+    YANDEX_RATE_DECREASE: float = float(os.getenv("YANDEX_RATE_DECREASE", "0.5"))
 
     PAYME_ID: str = os.getenv("PAYME_ID", "")
     PAYME_KEY: str = os.getenv("PAYME_KEY", "")
@@ -1,28 +1,237 @@
 import aiosqlite
+import asyncio
 import logging
+import re
+import sqlite3
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Optional, List
-from .models import User, Driver, Document, BotSetting, Transaction, AdminAction
+from pathlib import Path
+from typing import AsyncIterator, Dict, Optional, List, Tuple
+from .models import (
+    User, Driver, Document, BotSetting, Transaction, AdminAction, StatsSnapshot,
+    from_row, select_columns, to_epoch
+)
+from .migrations import EPOCH_NOW, run_migrations
+from .group_commit import CommitStats, GroupCommitter, WriteResult
+from .cache import LRUTTLCache
 from config import settings
+from utils.transliteration import fold_text
 
 logger = logging.getLogger(__name__)
 
+sqlite3.register_adapter(datetime, to_epoch)
+
+DRIVER_FILTERS = {
+    "all": "1 = 1",
+    "active": "is_active = 1",
+    "inactive": f"(last_trip_date IS NULL OR last_trip_date < {EPOCH_NOW} - :days * 86400)",
+    "linked": "yandex_driver_id IS NOT NULL",
+}
+
+SEARCH_RANK_WINDOW = 500
+
+REFRESH_ACTIVITY = "MAX(COALESCE(last_trip_date, 0), COALESCE(balance_changed_at, 0), COALESCE(last_seen_at, 0))"
+
+def parse_refresh_tiers(value: str, dormant_interval: int) -> List[Tuple[int, int]]:
+    tiers = []
+    for item in value.split(","):
+        days, _, interval = item.strip().partition(":")
+        if days and interval:
+            tiers.append((int(float(days) * 86400), int(interval)))
+    tiers.sort()
+    tiers.append((0, dormant_interval))
+    return tiers
+
+def refresh_tier_case(tiers: List[Tuple[int, int]], values) -> str:
+    # tiers are (activity window, refresh interval) in seconds; the last one catches everything older.
+    values = list(values)
+    cases = ' '.join(
+        f'WHEN {REFRESH_ACTIVITY} >= {EPOCH_NOW} - {int(window)} THEN {value}'
+        for (window, _), value in zip(tiers[:-1], values)
+    )
+    return f'CASE {cases} ELSE {values[-1]} END' if cases else str(values[-1])
+
+async def vacuum_into(conn: aiosqlite.Connection, path: str) -> int:
+    cursor = await conn.execute('PRAGMA page_count')
+    pages = (await cursor.fetchone())[0]
+    await conn.execute('VACUUM INTO ?', (path,))
+    return pages
+
+class BackupRestarted(Exception):
+    pass
+
+def stepped_backup(source_uri: str, path: str, pages: int, sleep: float, max_restarts: int) -> int:
+    # Runs in a worker thread on its own connections; the copy restarts whenever another connection commits.
+    copied = {"remaining": None, "total": 0, "restarts": 0}
+
+    def progress(status, remaining, total):
+        if copied["remaining"] is not None and remaining > copied["remaining"]:
+            copied["restarts"] += 1
+            if copied["restarts"] > max_restarts:
+                raise BackupRestarted(f"backup restarted {copied['restarts']} times")
+        copied["remaining"] = remaining
+        copied["total"] = total
+
+    source = sqlite3.connect(source_uri, uri=True)
+    target = sqlite3.connect(path)
+    try:
+        source.backup(target, pages=pages, progress=progress, sleep=sleep)
+    finally:
+        target.close()
+        source.close()
+    return copied["total"]
+
+# Per archived table: the rollup kind, status and amount expressions.
+ROLLUP_COLUMNS = {
+    "transactions": ("transaction_type", "status", "amount"),
+    "admin_actions": ("action_type", "''", "0.0"),
+}
+
+ARCHIVE_SCHEMA = [
+    '''CREATE TABLE IF NOT EXISTS archive.transactions (
+        id INTEGER PRIMARY KEY,
+        telegram_id INTEGER NOT NULL,
+        amount REAL NOT NULL,
+        transaction_type TEXT,
+        status TEXT,
+        card_number TEXT,
+        payme_transaction_id TEXT,
+        error_message TEXT,
+        created_at INTEGER,
+        updated_at INTEGER
+    )''',
+    'CREATE INDEX IF NOT EXISTS archive.idx_transactions_created_at ON transactions(created_at)',
+    '''CREATE TABLE IF NOT EXISTS archive.admin_actions (
+        id INTEGER PRIMARY KEY,
+        admin_id INTEGER NOT NULL,
+        action_type TEXT NOT NULL,
+        target_id INTEGER NOT NULL,
+        reason TEXT,
+        created_at INTEGER
+    )''',
+    'CREATE INDEX IF NOT EXISTS archive.idx_admin_actions_created_at ON admin_actions(created_at)',
+]
+
+USER_COLUMNS = select_columns(User, "users")
+DRIVER_COLUMNS = select_columns(Driver, "drivers")
+DOCUMENT_COLUMNS = select_columns(Document, "documents")
+TRANSACTION_COLUMNS = select_columns(Transaction, "transactions")
+
 class Database:
     def __init__(self):
         self.db_path = settings.DATABASE_PATH
         self.conn: Optional[aiosqlite.Connection] = None
+        self.readers: List[aiosqlite.Connection] = []
+        self._read_pool: Optional[asyncio.Queue] = None
+        self._write_lock = asyncio.Lock()
+        self.commit_stats = CommitStats()
+        self.group_commit: Optional[GroupCommitter] = None
+        self._settings: dict = {}
+        self._admin_id_list: tuple = ()
+        self._admin_ids: frozenset = frozenset()
+        self.user_context_cache = LRUTTLCache(
+            maxsize=settings.USER_CONTEXT_CACHE_SIZE,
+            ttl=settings.USER_CONTEXT_CACHE_TTL
+        )
+        self._context_generation = 0
+        self.refresh_tiers = parse_refresh_tiers(settings.REFRESH_TIERS, settings.REFRESH_DORMANT_INTERVAL)
+
+    @property
+    def wal_mode(self) -> bool:
+        return settings.DATABASE_WAL_MODE and self.db_path != ":memory:"
 
     async def connect(self):
-        self.conn = await aiosqlite.connect(self.db_path)
-        self.conn.row_factory = aiosqlite.Row
+        self.conn = await self._open_connection()
         await self.create_tables()
-        logger.info("Database connected successfully")
+        version = await run_migrations(self.conn)
+        await self.load_settings()
+
+        if self.wal_mode and settings.DATABASE_READ_POOL_SIZE > 0:
+            self._read_pool = asyncio.Queue()
+            for _ in range(settings.DATABASE_READ_POOL_SIZE):
+                reader = await self._open_connection(read_only=True)
+                self.readers.append(reader)
+                self._read_pool.put_nowait(reader)
+
+        if settings.DATABASE_GROUP_COMMIT:
+            self.group_commit = GroupCommitter(
+                self.conn, self._write_lock, self.commit_stats,
+                max_statements=settings.DATABASE_GROUP_COMMIT_MAX_STATEMENTS,
+                max_delay_ms=settings.DATABASE_GROUP_COMMIT_MAX_DELAY_MS
+            )
+
+        logger.info(
+            f"Database connected successfully (schema version {version}, "
+            f"{'WAL' if self.wal_mode else 'rollback journal'}, {len(self.readers)} readers)"
+        )
 
     async def close(self):
+        if self.group_commit:
+            await self.group_commit.drain()
+            self.group_commit = None
+
+        for reader in self.readers:
+            await reader.close()
+        self.readers = []
+        self._read_pool = None
+
         if self.conn:
             await self.conn.close()
             logger.info("Database connection closed")
 
+    async def _open_connection(self, read_only: bool = False) -> aiosqlite.Connection:
+        if read_only:
+            uri = f"{Path(self.db_path).absolute().as_uri()}?mode=ro"
+            conn = await aiosqlite.connect(uri, uri=True)
+        else:
+            conn = await aiosqlite.connect(self.db_path)
+        await conn.create_function("translit", -1, fold_text, deterministic=True)
+
+        await conn.execute(f'PRAGMA busy_timeout = {settings.DATABASE_BUSY_TIMEOUT_MS}')
+        await conn.execute(f'PRAGMA cache_size = -{settings.DATABASE_CACHE_SIZE_KB}')
+        if self.wal_mode and not read_only:
+            await conn.execute('PRAGMA journal_mode = WAL')
+            await conn.execute('PRAGMA synchronous = NORMAL')
+        return conn
+
+    @asynccontextmanager
+    async def _reader(self):
+        if self._read_pool is None:
+            yield self.conn
+            return
+
+        conn = await self._read_pool.get()
+        try:
+            yield conn
+        finally:
+            self._read_pool.put_nowait(conn)
+
+    async def _fetchone(self, sql: str, params=()):
+        async with self._reader() as conn:
+            cursor = await conn.execute(sql, params)
+            return await cursor.fetchone()
+
+    async def _fetchall(self, sql: str, params=()):
+        async with self._reader() as conn:
+            cursor = await conn.execute(sql, params)
+            return await cursor.fetchall()
+
+    async def _write(self, sql: str, params: tuple = ()) -> WriteResult:
+        if self.group_commit:
+            return await self.group_commit.submit(sql, params)
+
+        async with self._write_lock:
+            cursor = await self.conn.execute(sql, params)
+            await self.conn.commit()
+        self.commit_stats.record(1)
+        return WriteResult(cursor.lastrowid, cursor.rowcount)
+
+    def get_write_stats(self) -> dict:
+        stats = self.commit_stats.as_dict()
+        stats["group_commit"] = self.group_commit is not None
+        return stats
+
     async def create_tables(self):
         await self.conn.execute('''
             CREATE TABLE IF NOT EXISTS users (
@@ -108,235 +317,587 @@ class Database:
         logger.info("Database tables created successfully")
 
     async def get_user(self, telegram_id: int) -> Optional[User]:
-        cursor = await self.conn.execute(
-            'SELECT * FROM users WHERE telegram_id = ?',
+        row = await self._fetchone(
+            f'SELECT {USER_COLUMNS} FROM users WHERE telegram_id = ?',
             (telegram_id,)
         )
-        row = await cursor.fetchone()
         if row:
-            return User(**dict(row))
+            return from_row(User, row)
         return None
 
     async def create_user(self, user: User) -> User:
-        await self.conn.execute(
+        await self._write(
             '''INSERT INTO users (telegram_id, phone, language, role, registration_status)
                VALUES (?, ?, ?, ?, ?)''',
             (user.telegram_id, user.phone, user.language, user.role, user.registration_status)
         )
-        await self.conn.commit()
+        self.invalidate_user_context(user.telegram_id)
         return await self.get_user(user.telegram_id)
 
     async def update_user(self, telegram_id: int, **kwargs):
         fields = ', '.join([f"{k} = ?" for k in kwargs.keys()])
         values = list(kwargs.values()) + [telegram_id]
-        await self.conn.execute(
-            f'UPDATE users SET {fields}, updated_at = CURRENT_TIMESTAMP WHERE telegram_id = ?',
+        await self._write(
+            f'UPDATE users SET {fields}, updated_at = {EPOCH_NOW} WHERE telegram_id = ?',
             values
         )
-        await self.conn.commit()
+        self.invalidate_user_context(telegram_id)
 
     async def get_driver(self, telegram_id: int) -> Optional[Driver]:
-        cursor = await self.conn.execute(
-            'SELECT * FROM drivers WHERE telegram_id = ?',
+        row = await self._fetchone(
+            f'SELECT {DRIVER_COLUMNS} FROM drivers WHERE telegram_id = ?',
             (telegram_id,)
         )
-        row = await cursor.fetchone()
         if row:
-            return Driver(**dict(row))
+            return from_row(Driver, row)
         return None
 
     async def get_driver_by_yandex_id(self, yandex_driver_id: str) -> Optional[Driver]:
-        cursor = await self.conn.execute(
-            'SELECT * FROM drivers WHERE yandex_driver_id = ?',
+        row = await self._fetchone(
+            f'SELECT {DRIVER_COLUMNS} FROM drivers WHERE yandex_driver_id = ?',
             (yandex_driver_id,)
         )
-        row = await cursor.fetchone()
         if row:
-            return Driver(**dict(row))
+            return from_row(Driver, row)
         return None
 
+    async def get_user_context(self, telegram_id: int) -> Tuple[Optional[User], Optional[Driver]]:
+        cached = self.user_context_cache.get(telegram_id)
+        if cached is not None:
+            return cached
+
+        generation = self._context_generation
+        row = await self._fetchone(
+            f'''SELECT {USER_COLUMNS}, {DRIVER_COLUMNS} FROM users
+               LEFT JOIN drivers ON drivers.telegram_id = users.telegram_id
+               WHERE users.telegram_id = ?''',
+            (telegram_id,)
+        )
+
+        user = driver = None
+        if row:
+            split = len(User.COLUMNS)
+            user = from_row(User, row[:split])
+            if row[split] is not None:
+                driver = from_row(Driver, row[split:])
+
+        if generation == self._context_generation:
+            self.user_context_cache.set(telegram_id, (user, driver))
+        return user, driver
+
+    def invalidate_user_context(self, telegram_id: int):
+        self._context_generation += 1
+        self.user_context_cache.invalidate(telegram_id)
+
     async def create_driver(self, driver: Driver) -> Driver:
-        cursor = await self.conn.execute(
+        await self._write(
             '''INSERT INTO drivers (telegram_id, yandex_driver_id, name, callsign, car_model, balance)
                VALUES (?, ?, ?, ?, ?, ?)''',
             (driver.telegram_id, driver.yandex_driver_id, driver.name,
              driver.callsign, driver.car_model, driver.balance)
         )
-        await self.conn.commit()
+        self.invalidate_user_context(driver.telegram_id)
         return await self.get_driver(driver.telegram_id)
 
     async def update_driver(self, telegram_id: int, **kwargs):
         fields = ', '.join([f"{k} = ?" for k in kwargs.keys()])
         values = list(kwargs.values()) + [telegram_id]
-        await self.conn.execute(
-            f'UPDATE drivers SET {fields}, updated_at = CURRENT_TIMESTAMP WHERE telegram_id = ?',
+        await self._write(
+            f'UPDATE drivers SET {fields}, updated_at = {EPOCH_NOW} WHERE telegram_id = ?',
             values
         )
-        await self.conn.commit()
+        self.invalidate_user_context(telegram_id)
+
+    async def upsert_drivers_many(self, rows: List[dict], watermark: Optional[Tuple[str, str]] = None) -> int:
+        rows = [row for row in rows if row.get("yandex_driver_id")]
+        if not rows and watermark is None:
+            return 0
+
+        matched = {}
+        yandex_ids = list({row["yandex_driver_id"] for row in rows})
+        for i in range(0, len(yandex_ids), 500):
+            chunk = yandex_ids[i:i + 500]
+            placeholders = ', '.join('?' * len(chunk))
+            rows_matched = await self._fetchall(
+                f'SELECT yandex_driver_id, telegram_id FROM drivers WHERE yandex_driver_id IN ({placeholders})',
+                chunk
+            )
+            for row in rows_matched:
+                matched[row[0]] = row[1]
+
+        updates = [row for row in rows if row["yandex_driver_id"] in matched]
+        if not updates and watermark is None:
+            return 0
+
+        updated = 0
+        async with self._write_lock:
+            try:
+                if updates:
+                    columns = [k for k in updates[0].keys() if k != "yandex_driver_id"]
+                    fields = ', '.join([f"{k} = ?" for k in columns])
+                    values = [
+                        [row.get(k) for k in columns] + [matched[row["yandex_driver_id"]]]
+                        for row in updates
+                    ]
+                    cursor = await self.conn.executemany(
+                        f'UPDATE drivers SET {fields}, updated_at = {EPOCH_NOW} WHERE telegram_id = ?',
+                        values
+                    )
+                    updated = cursor.rowcount
+                if watermark is not None:
+                    await self.conn.execute(
+                        f'''INSERT INTO settings (key, value) VALUES (?, ?)
+                           ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated_at = {EPOCH_NOW}''',
+                        watermark
+                    )
+                await self.conn.commit()
+            except Exception:
+                await self.conn.rollback()
+                raise
+        self.commit_stats.record(len(updates) + (watermark is not None))
+        if watermark is not None:
+            self._settings[watermark[0]] = watermark[1]
+        for telegram_id in matched.values():
+            self.invalidate_user_context(telegram_id)
+        return updated
+
+    async def touch_drivers_synced(self, yandex_ids: List[str], synced_at: datetime) -> int:
+        return await self._reschedule_drivers(yandex_ids, synced_at, 'last_sync = ?, ')
+
+    async def postpone_driver_refresh(self, yandex_ids: List[str], checked_at: datetime) -> int:
+        return await self._reschedule_drivers(yandex_ids, checked_at, '')
+
+    async def _reschedule_drivers(self, yandex_ids: List[str], at: datetime, assignments: str) -> int:
+        # Each driver is due again after the refresh interval of its activity tier.
+        interval = refresh_tier_case(self.refresh_tiers, (interval for _, interval in self.refresh_tiers))
+        touched = 0
+        for i in range(0, len(yandex_ids), 500):
+            chunk = yandex_ids[i:i + 500]
+            placeholders = ', '.join('?' * len(chunk))
+            rows = await self._fetchall(
+                f'SELECT telegram_id FROM drivers WHERE yandex_driver_id IN ({placeholders})',
+                chunk
+            )
+            if not rows:
+                continue
+            result = await self._write(
+                f'''UPDATE drivers SET {assignments}next_refresh_at = ? + {interval}
+                   WHERE yandex_driver_id IN ({placeholders})''',
+                (at,) * (assignments.count('?') + 1) + tuple(chunk)
+            )
+            touched += result.rowcount
+            for (telegram_id,) in rows:
+                self.invalidate_user_context(telegram_id)
+        return touched
+
+    async def touch_drivers_seen(self, telegram_ids: List[int]):
+        # A driver using the bot moves into the active tier, so pull its next refresh forward.
+        for i in range(0, len(telegram_ids), 500):
+            chunk = telegram_ids[i:i + 500]
+            placeholders = ', '.join('?' * len(chunk))
+            await self._write(
+                f'''UPDATE drivers SET last_seen_at = {EPOCH_NOW},
+                       next_refresh_at = MIN(next_refresh_at, COALESCE(last_sync, 0) + ?)
+                   WHERE telegram_id IN ({placeholders})''',
+                (self.refresh_tiers[0][1], *chunk)
+            )
+
+    async def get_refresh_candidates(self, limit: int) -> List[Tuple[str, int]]:
+        tier = refresh_tier_case(self.refresh_tiers, range(len(self.refresh_tiers)))
+        return await self._fetchall(
+            f'''SELECT yandex_driver_id, {tier} FROM drivers
+               WHERE {DRIVER_FILTERS["linked"]} AND next_refresh_at <= ?
+               ORDER BY next_refresh_at LIMIT ?''',
+            (int(time.time()), limit)
+        )
+
+    async def count_due_refreshes(self) -> int:
+        row = await self._fetchone(
+            f'SELECT COUNT(*) FROM drivers WHERE {DRIVER_FILTERS["linked"]} AND next_refresh_at <= ?',
+            (int(time.time()),)
+        )
+        return row[0]
+
+    async def get_profile_hashes(self, yandex_ids: Optional[List[str]] = None) -> Dict[str, Optional[str]]:
+        if yandex_ids is None:
+            rows = await self._fetchall(
+                'SELECT yandex_driver_id, profile_hash FROM drivers WHERE yandex_driver_id IS NOT NULL'
+            )
+            return dict(rows)
+
+        hashes = {}
+        for i in range(0, len(yandex_ids), 500):
+            chunk = yandex_ids[i:i + 500]
+            placeholders = ', '.join('?' * len(chunk))
+            rows = await self._fetchall(
+                f'SELECT yandex_driver_id, profile_hash FROM drivers WHERE yandex_driver_id IN ({placeholders})',
+                chunk
+            )
+            hashes.update(rows)
+        return hashes
 
     async def get_all_drivers(self) -> List[Driver]:
-        cursor = await self.conn.execute('SELECT * FROM drivers')
-        rows = await cursor.fetchall()
-        return [Driver(**dict(row)) for row in rows]
+        rows = await self._fetchall(f'SELECT {DRIVER_COLUMNS} FROM drivers')
+        return [from_row(Driver, row) for row in rows]
 
     async def get_active_drivers(self) -> List[Driver]:
-        cursor = await self.conn.execute('SELECT * FROM drivers WHERE is_active = 1')
-        rows = await cursor.fetchall()
-        return [Driver(**dict(row)) for row in rows]
+        rows = await self._fetchall(f'SELECT {DRIVER_COLUMNS} FROM drivers WHERE is_active = 1')
+        return [from_row(Driver, row) for row in rows]
 
     async def get_inactive_drivers(self, days: int = 7) -> List[Driver]:
-        cursor = await self.conn.execute(
-            '''SELECT * FROM drivers
+        rows = await self._fetchall(
+            f'''SELECT {DRIVER_COLUMNS} FROM drivers
                WHERE last_trip_date IS NULL
-               OR datetime(last_trip_date) < datetime('now', '-' || ? || ' days')''',
+               OR last_trip_date < {EPOCH_NOW} - ? * 86400''',
             (days,)
         )
-        rows = await cursor.fetchall()
-        return [Driver(**dict(row)) for row in rows]
+        return [from_row(Driver, row) for row in rows]
+
+    async def iter_drivers(self, filter: str = "all", batch_size: int = 500,
+                           days: int = 7) -> AsyncIterator[Driver]:
+        condition = DRIVER_FILTERS[filter]
+        last_id = 0
+
+        while True:
+            rows = await self._fetchall(
+                f'SELECT {DRIVER_COLUMNS} FROM drivers WHERE id > :last_id AND {condition} ORDER BY id LIMIT :limit',
+                {"last_id": last_id, "days": days, "limit": batch_size}
+            )
+            if not rows:
+                return
+
+            for row in rows:
+                yield from_row(Driver, row)
+
+            if len(rows) < batch_size:
+                return
+            last_id = rows[-1][0]
 
     async def save_document(self, doc: Document) -> Document:
-        cursor = await self.conn.execute(
+        result = await self._write(
             '''INSERT INTO documents (telegram_id, document_type, file_id, message_id, chat_id)
                VALUES (?, ?, ?, ?, ?)''',
             (doc.telegram_id, doc.document_type, doc.file_id, doc.message_id, doc.chat_id)
         )
-        await self.conn.commit()
-        doc.id = cursor.lastrowid
+        doc.id = result.lastrowid
         return doc
 
     async def get_documents(self, telegram_id: int) -> List[Document]:
-        cursor = await self.conn.execute(
-            'SELECT * FROM documents WHERE telegram_id = ? ORDER BY created_at',
+        rows = await self._fetchall(
+            f'SELECT {DOCUMENT_COLUMNS} FROM documents WHERE telegram_id = ? ORDER BY created_at',
             (telegram_id,)
         )
-        rows = await cursor.fetchall()
-        return [Document(**dict(row)) for row in rows]
+        return [from_row(Document, row) for row in rows]
 
     async def delete_documents(self, telegram_id: int):
-        await self.conn.execute(
+        await self._write(
             'DELETE FROM documents WHERE telegram_id = ?',
             (telegram_id,)
         )
-        await self.conn.commit()
+
+    async def load_settings(self):
+        rows = await self._fetchall('SELECT key, value FROM settings')
+        self._settings = dict(rows)
+        self._cache_admin_ids(self._settings.get('admin_ids'))
+
+    def _cache_admin_ids(self, value: Optional[str]):
+        ids = [int(id.strip()) for id in value.split(',') if id.strip()] if value else []
+        self._admin_id_list = tuple(ids)
+        self._admin_ids = frozenset(ids)
 
     async def get_setting(self, key: str) -> Optional[str]:
-        cursor = await self.conn.execute(
-            'SELECT value FROM settings WHERE key = ?',
-            (key,)
-        )
-        row = await cursor.fetchone()
-        return row['value'] if row else None
+        return self._settings.get(key)
 
     async def set_setting(self, key: str, value: str):
-        await self.conn.execute(
-            '''INSERT INTO settings (key, value) VALUES (?, ?)
-               ON CONFLICT(key) DO UPDATE SET value = ?, updated_at = CURRENT_TIMESTAMP''',
+        await self._write(
+            f'''INSERT INTO settings (key, value) VALUES (?, ?)
+               ON CONFLICT(key) DO UPDATE SET value = ?, updated_at = {EPOCH_NOW}''',
             (key, value, value)
         )
-        await self.conn.commit()
+        self._settings[key] = value
+        if key == 'admin_ids':
+            self._cache_admin_ids(value)
 
     async def get_all_settings(self) -> dict:
-        cursor = await self.conn.execute('SELECT key, value FROM settings')
-        rows = await cursor.fetchall()
-        return {row['key']: row['value'] for row in rows}
+        return dict(self._settings)
 
     async def get_admin_ids(self) -> List[int]:
-        value = await self.get_setting('admin_ids')
-        if value:
-            return [int(id.strip()) for id in value.split(',') if id.strip()]
-        return []
+        return list(self._admin_id_list)
+
+    def is_admin(self, telegram_id: int) -> bool:
+        return telegram_id in self._admin_ids
 
     async def set_admin_ids(self, ids: List[int]):
         await self.set_setting('admin_ids', ','.join(map(str, ids)))
 
     async def create_transaction(self, transaction: Transaction) -> Transaction:
-        cursor = await self.conn.execute(
+        result = await self._write(
             '''INSERT INTO transactions (telegram_id, amount, transaction_type, status, card_number)
                VALUES (?, ?, ?, ?, ?)''',
             (transaction.telegram_id, transaction.amount, transaction.transaction_type,
              transaction.status, transaction.card_number)
         )
-        await self.conn.commit()
-        transaction.id = cursor.lastrowid
+        transaction.id = result.lastrowid
         return transaction
 
     async def update_transaction(self, transaction_id: int, **kwargs):
         fields = ', '.join([f"{k} = ?" for k in kwargs.keys()])
         values = list(kwargs.values()) + [transaction_id]
-        await self.conn.execute(
-            f'UPDATE transactions SET {fields}, updated_at = CURRENT_TIMESTAMP WHERE id = ?',
+        await self._write(
+            f'UPDATE transactions SET {fields}, updated_at = {EPOCH_NOW} WHERE id = ?',
             values
         )
-        await self.conn.commit()
 
     async def get_transaction(self, transaction_id: int) -> Optional[Transaction]:
-        cursor = await self.conn.execute(
-            'SELECT * FROM transactions WHERE id = ?',
+        row = await self._fetchone(
+            f'SELECT {TRANSACTION_COLUMNS} FROM transactions WHERE id = ?',
             (transaction_id,)
         )
-        row = await cursor.fetchone()
         if row:
-            return Transaction(**dict(row))
+            return from_row(Transaction, row)
         return None
 
     async def get_all_transactions(self) -> List[Transaction]:
-        cursor = await self.conn.execute(
-            'SELECT * FROM transactions ORDER BY created_at DESC'
+        rows = await self._fetchall(
+            f'SELECT {TRANSACTION_COLUMNS} FROM transactions ORDER BY created_at DESC'
+        )
+        return [from_row(Transaction, row) for row in rows]
+
+    async def get_transactions_page(self, limit: int = 20,
+                                    after: Optional[Tuple[int, int]] = None,
+                                    before: Optional[Tuple[int, int]] = None,
+                                    status: Optional[str] = None,
+                                    telegram_id: Optional[int] = None,
+                                    date_from: Optional[datetime] = None,
+                                    date_to: Optional[datetime] = None) -> List[Transaction]:
+        conditions = []
+        params = []
+
+        if status:
+            conditions.append('status = ?')
+            params.append(status)
+        if telegram_id:
+            conditions.append('telegram_id = ?')
+            params.append(telegram_id)
+        if date_from:
+            conditions.append('created_at >= ?')
+            params.append(date_from)
+        if date_to:
+            conditions.append('created_at < ?')
+            params.append(date_to)
+
+        if before:
+            conditions.append('(created_at, id) > (?, ?)')
+            params.extend(before)
+            order = 'ASC'
+        else:
+            if after:
+                conditions.append('(created_at, id) < (?, ?)')
+                params.extend(after)
+            order = 'DESC'
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        rows = await self._fetchall(
+            f'SELECT {TRANSACTION_COLUMNS} FROM transactions {where} ORDER BY created_at {order}, id {order} LIMIT ?',
+            params + [limit]
         )
-        rows = await cursor.fetchall()
-        return [Transaction(**dict(row)) for row in rows]
+        transactions = [from_row(Transaction, row) for row in rows]
+        if before:
+            transactions.reverse()
+        return transactions
+
+    async def get_fsm_record(self, key: str) -> Optional[Tuple[Optional[str], str]]:
+        row = await self._fetchone('SELECT state, data FROM fsm_storage WHERE key = ?', (key,))
+        return tuple(row) if row else None
+
+    async def save_fsm_records(self, records: List[Tuple[str, Optional[str], Optional[str]]]):
+        upserts = [(key, state, data) for key, state, data in records if data is not None]
+        deletes = [(key,) for key, _, data in records if data is None]
+
+        async with self._write_lock:
+            try:
+                if upserts:
+                    await self.conn.executemany(
+                        f'''INSERT INTO fsm_storage (key, state, data) VALUES (?, ?, ?)
+                            ON CONFLICT(key) DO UPDATE
+                            SET state = excluded.state, data = excluded.data, updated_at = {EPOCH_NOW}''',
+                        upserts
+                    )
+                if deletes:
+                    await self.conn.executemany('DELETE FROM fsm_storage WHERE key = ?', deletes)
+                await self.conn.commit()
+            except Exception:
+                await self.conn.rollback()
+                raise
+        self.commit_stats.record(len(records))
+
+    async def get_transaction_totals(self) -> dict:
+        rows = await self._fetchall('SELECT status, count, amount FROM transaction_totals WHERE count > 0')
+        return {status: (count, amount) for status, count, amount in rows}
+
+    async def snapshot_to(self, path: str) -> int:
+        # VACUUM INTO copies a single read snapshot, so commits made meanwhile cannot restart it.
+        if self.wal_mode:
+            conn = await self._open_connection(read_only=True)
+            try:
+                return await vacuum_into(conn, path)
+            finally:
+                await conn.close()
+
+        # Without WAL a snapshot holds off writers for its whole run, so copy in short steps from a
+        # separate connection and only take the writer's lock if steady commits keep restarting it.
+        uri = f"{Path(self.db_path).absolute().as_uri()}?mode=ro"
+        try:
+            return await asyncio.to_thread(
+                stepped_backup, uri, path, settings.BACKUP_PAGES_PER_STEP,
+                settings.BACKUP_STEP_SLEEP_MS / 1000, settings.BACKUP_MAX_RESTARTS
+            )
+        except BackupRestarted as e:
+            logger.warning(f"Stepped backup gave up ({e}), taking a locked snapshot")
+
+        Path(path).unlink(missing_ok=True)
+        async with self._write_lock:
+            return await vacuum_into(self.conn, path)
+
+    async def archive_old_rows(self, table: str, older_than_days: int, batch_size: int = 1000) -> int:
+        kind, status, amount = ROLLUP_COLUMNS[table]
+        model = Transaction if table == "transactions" else AdminAction
+        columns = ', '.join(model.COLUMNS)
+        # Whole UTC days only, so each day's rollup is written exactly once.
+        cutoff = (int(time.time()) // 86400 - older_than_days) * 86400
+        moved = 0
+
+        async with self._write_lock:
+            await self.conn.execute('ATTACH DATABASE ? AS archive', (settings.ARCHIVE_DATABASE_PATH,))
+            try:
+                for sql in ARCHIVE_SCHEMA:
+                    await self.conn.execute(sql)
+                await self.conn.commit()
+            except Exception:
+                await self.conn.execute('DETACH DATABASE archive')
+                raise
+
+        # main and archive are separate files, and a transaction spanning both is not atomic in WAL
+        # mode. So each batch commits the archive copy first, then rolls up and deletes only the rows
+        # the archive confirms it holds. A crash in between leaves rows in both files, which the next
+        # run copies with INSERT OR IGNORE and deletes; a row is never missing from both.
+        last_id = 0
+        try:
+            while True:
+                async with self._write_lock:
+                    cursor = await self.conn.execute(
+                        f'''SELECT MIN(id), MAX(id) FROM (
+                               SELECT id FROM main.{table} WHERE created_at < ? AND id > ? ORDER BY id LIMIT ?
+                           )''',
+                        (cutoff, last_id, batch_size)
+                    )
+                    lower, upper = await cursor.fetchone()
+                    if upper is None:
+                        break
+
+                    batch = (cutoff, lower, upper)
+                    try:
+                        await self.conn.execute(
+                            f'''INSERT OR IGNORE INTO archive.{table} ({columns})
+                                SELECT {columns} FROM main.{table} WHERE created_at < ? AND id BETWEEN ? AND ?''',
+                            batch
+                        )
+                        await self.conn.commit()
+                    except Exception:
+                        await self.conn.rollback()
+                        raise
+                    self.commit_stats.record(1)
+
+                    archived = (
+                        f'created_at < ? AND id BETWEEN ? AND ? '
+                        f'AND id IN (SELECT id FROM archive.{table} WHERE id BETWEEN ? AND ?)'
+                    )
+                    params = batch + (lower, upper)
+                    try:
+                        await self.conn.execute(
+                            f'''INSERT INTO daily_rollups (source, day, kind, status, count, amount)
+                                SELECT '{table}', created_at - created_at % 86400, {kind}, {status},
+                                       COUNT(*), COALESCE(SUM({amount}), 0.0)
+                                FROM main.{table} WHERE {archived}
+                                GROUP BY 2, 3, 4
+                                ON CONFLICT (source, day, kind, status) DO UPDATE
+                                SET count = count + excluded.count, amount = amount + excluded.amount''',
+                            params
+                        )
+                        cursor = await self.conn.execute(f'DELETE FROM main.{table} WHERE {archived}', params)
+                        await self.conn.commit()
+                    except Exception:
+                        await self.conn.rollback()
+                        raise
+
+                    moved += cursor.rowcount
+                    last_id = upper
+                    self.commit_stats.record(2)
+                await asyncio.sleep(0)
+        finally:
+            async with self._write_lock:
+                await self.conn.execute('DETACH DATABASE archive')
+
+        if moved:
+            logger.info(f"Archived {moved} rows from {table} older than {older_than_days} days")
+        return moved
 
     async def log_admin_action(self, action: AdminAction):
-        await self.conn.execute(
+        await self._write(
             '''INSERT INTO admin_actions (admin_id, action_type, target_id, reason)
                VALUES (?, ?, ?, ?)''',
             (action.admin_id, action.action_type, action.target_id, action.reason)
         )
-        await self.conn.commit()
 
     async def get_user_count(self) -> int:
-        cursor = await self.conn.execute('SELECT COUNT(*) as count FROM users')
-        row = await cursor.fetchone()
-        return row['count']
+        row = await self._fetchone('SELECT COUNT(*) FROM users')
+        return row[0]
 
     async def get_driver_count(self) -> int:
-        cursor = await self.conn.execute('SELECT COUNT(*) as count FROM drivers')
-        row = await cursor.fetchone()
-        return row['count']
+        row = await self._fetchone('SELECT COUNT(*) FROM drivers')
+        return row[0]
 
     async def get_pending_registrations_count(self) -> int:
-        cursor = await self.conn.execute(
-            "SELECT COUNT(*) as count FROM users WHERE registration_status = 'pending'"
+        row = await self._fetchone(
+            "SELECT COUNT(*) FROM users WHERE registration_status = 'pending'"
         )
-        row = await cursor.fetchone()
-        return row['count']
-
-    async def get_driver_by_yandex_id(self, yandex_driver_id: str) -> Optional[Driver]:
-        cursor = await self.conn.execute(
-            'SELECT * FROM drivers WHERE yandex_driver_id = ?',
-            (yandex_driver_id,)
+        return row[0]
+
+    async def get_stats_snapshot(self, inactive_days: int = 7) -> StatsSnapshot:
+        row = await self._fetchone(
+            f'''SELECT
+                   (SELECT value FROM stats_counters WHERE name = 'users') AS total_users,
+                   (SELECT value FROM stats_counters WHERE name = 'drivers') AS total_drivers,
+                   (SELECT value FROM stats_counters WHERE name = 'pending_registrations') AS pending_registrations,
+                   (SELECT value FROM stats_counters WHERE name = 'active_drivers') AS active_drivers,
+                   (SELECT COUNT(*) FROM drivers
+                    WHERE last_trip_date IS NULL
+                    OR last_trip_date < {EPOCH_NOW} - ? * 86400) AS inactive_drivers''',
+            (inactive_days,)
         )
-        row = await cursor.fetchone()
-        if row:
-            return Driver(**dict(row))
-        return None
+        return StatsSnapshot(*(value or 0 for value in row))
 
-    async def search_drivers(self, query: str) -> List[Driver]:
-        q = f'%{query}%'
-        cursor = await self.conn.execute(
-            '''SELECT * FROM drivers WHERE
-               name LIKE ? OR
-               callsign LIKE ? OR
-               car_model LIKE ? OR
-               yandex_driver_id LIKE ?
-               LIMIT 20''',
-            (q, q, q, q)
+    async def search_drivers(self, query: str, limit: int = 20) -> List[Driver]:
+        tokens = re.findall(r'\w+', fold_text(query))
+        if not tokens:
+            return []
+
+        match = 'translit : (' + ' AND '.join(f'"{token}"*' for token in tokens) + ')'
+
+        # bm25 has to score every hit, so only rank when the match set is small;
+        # broad queries (one letter, a common car model) come back in index order.
+        candidates = await self._fetchall(
+            'SELECT rowid FROM drivers_fts WHERE drivers_fts MATCH ? LIMIT ?',
+            (match, SEARCH_RANK_WINDOW + 1)
+        )
+        order = 'drivers_fts.rank' if len(candidates) <= SEARCH_RANK_WINDOW else 'drivers_fts.rowid'
+
+        rows = await self._fetchall(
+            f'''SELECT {DRIVER_COLUMNS} FROM drivers_fts
+                JOIN drivers ON drivers.id = drivers_fts.rowid
+                WHERE drivers_fts MATCH ?
+                ORDER BY {order}
+                LIMIT ?''',
+            (match, limit)
         )
-        rows = await cursor.fetchall()
-        return [Driver(**dict(row)) for row in rows]
-
-    async def backup_database(self, backup_path: str):
-        backup_conn = await aiosqlite.connect(backup_path)
-        await self.conn.backup(backup_conn)
-        await backup_conn.close()
-        logger.info(f"Database backed up to {backup_path}")
+        return [from_row(Driver, row) for row in rows]
@@ -0,0 +1,114 @@
+import asyncio
+import logging
+from collections import Counter, namedtuple
+from typing import List, Optional, Tuple
+
+import aiosqlite
+
+logger = logging.getLogger(__name__)
+
+WriteResult = namedtuple("WriteResult", ["lastrowid", "rowcount"])
+
+class CommitStats:
+    def __init__(self):
+        self.commits = 0
+        self.statements = 0
+        self.max_batch = 0
+        self.last_batch = 0
+        self.batch_sizes = Counter()
+
+    def record(self, statements: int):
+        self.commits += 1
+        self.statements += statements
+        self.last_batch = statements
+        self.max_batch = max(self.max_batch, statements)
+        self.batch_sizes[statements] += 1
+
+    def as_dict(self) -> dict:
+        return {
+            "commits": self.commits,
+            "statements": self.statements,
+            "avg_statements_per_commit": round(self.statements / self.commits, 2) if self.commits else 0.0,
+            "max_statements_per_commit": self.max_batch,
+            "last_statements_per_commit": self.last_batch,
+            "batch_sizes": dict(sorted(self.batch_sizes.items())),
+        }
+
+class GroupCommitter:
+    def __init__(self, conn: aiosqlite.Connection, lock: asyncio.Lock, stats: CommitStats,
+                 max_statements: int = 64, max_delay_ms: int = 10):
+        self.conn = conn
+        self.lock = lock
+        self.stats = stats
+        self.max_statements = max_statements
+        self.max_delay = max_delay_ms / 1000
+        self._pending: List[Tuple[str, tuple, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flushes = set()
+
+    async def submit(self, sql: str, params: tuple = ()) -> WriteResult:
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((sql, params, future))
+
+        if len(self._pending) >= self.max_statements:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_delay, self._start_flush)
+
+        return await future
+
+    async def drain(self):
+        self._start_flush()
+        while self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+
+    def _start_flush(self):
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, []
+        task = asyncio.create_task(self._flush(batch))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, batch: List[Tuple[str, tuple, asyncio.Future]]):
+        results = []
+
+        async with self.lock:
+            try:
+                for sql, params, future in batch:
+                    try:
+                        cursor = await self.conn.execute(sql, params)
+                        results.append((future, WriteResult(cursor.lastrowid, cursor.rowcount)))
+                    except Exception as e:
+                        if not self.conn.in_transaction and any(
+                            not isinstance(result, Exception) for _, result in results
+                        ):
+                            raise
+                        results.append((future, e))
+                await self.conn.commit()
+            except Exception as e:
+                logger.error(f"Group commit of {len(batch)} statements failed: {e}")
+                try:
+                    await self.conn.rollback()
+                except Exception:
+                    pass
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+
+        self.stats.record(len(batch))
+        logger.debug(f"Group commit carried {len(batch)} statements")
+
+        for future, result in results:
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
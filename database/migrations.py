@@ -0,0 +1,271 @@
+import logging
+import re
+
+import aiosqlite
+
+logger = logging.getLogger(__name__)
+
+EPOCH_NOW = "CAST(strftime('%s', 'now') AS INTEGER)"
+
+EPOCH_TABLES = ["users", "drivers", "documents", "settings", "transactions", "admin_actions"]
+
+# Written by the bot with naive datetime.now(), i.e. server local time;
+# every other stored timestamp is CURRENT_TIMESTAMP or offset-aware, i.e. UTC.
+LOCAL_TIME_COLUMNS = {("drivers", "last_sync"), ("drivers", "last_manual_sync")}
+
+CONVERT_BATCH_SIZE = 5000
+
+TIMESTAMP_COLUMN = re.compile(r'(\w+) TIMESTAMP( DEFAULT CURRENT_TIMESTAMP)?')
+
+async def rebuild_with_epoch_timestamps(conn: aiosqlite.Connection, table: str):
+    cursor = await conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+    )
+    table_sql = (await cursor.fetchone())[0]
+
+    cursor = await conn.execute(
+        "SELECT sql FROM sqlite_master WHERE tbl_name = ? AND type IN ('index', 'trigger') AND sql IS NOT NULL",
+        (table,)
+    )
+    dependents = [row[0] for row in await cursor.fetchall()]
+
+    cursor = await conn.execute(f'PRAGMA table_info({table})')
+    columns = [(row[1], row[2].upper()) for row in await cursor.fetchall()]
+
+    new_sql = re.sub(r'^CREATE TABLE (IF NOT EXISTS )?\w+', f'CREATE TABLE {table}_new', table_sql.strip())
+    new_sql = TIMESTAMP_COLUMN.sub(
+        lambda m: f"{m.group(1)} INTEGER" + (f" DEFAULT ({EPOCH_NOW})" if m.group(2) else ""),
+        new_sql
+    )
+    await conn.execute(new_sql)
+
+    exprs = []
+    for name, type_ in columns:
+        if type_ != 'TIMESTAMP':
+            exprs.append(name)
+            continue
+        modifier = ", 'utc'" if (table, name) in LOCAL_TIME_COLUMNS else ""
+        exprs.append(
+            f"CASE WHEN typeof({name}) = 'integer' THEN {name} "
+            f"ELSE CAST(strftime('%s', {name}{modifier}) AS INTEGER) END"
+        )
+    names = ', '.join(name for name, _ in columns)
+
+    last_rowid = 0
+    while True:
+        cursor = await conn.execute(
+            f'SELECT MAX(rowid) FROM (SELECT rowid FROM {table} WHERE rowid > ? ORDER BY rowid LIMIT ?)',
+            (last_rowid, CONVERT_BATCH_SIZE)
+        )
+        upper = (await cursor.fetchone())[0]
+        if upper is None:
+            break
+        await conn.execute(
+            f'INSERT INTO {table}_new ({names}) SELECT {", ".join(exprs)} FROM {table} '
+            f'WHERE rowid > ? AND rowid <= ?',
+            (last_rowid, upper)
+        )
+        last_rowid = upper
+
+    await conn.execute(f'DROP TABLE {table}')
+    await conn.execute(f'ALTER TABLE {table}_new RENAME TO {table}')
+    for sql in dependents:
+        await conn.execute(sql)
+
+async def convert_timestamps_to_epoch(conn: aiosqlite.Connection):
+    for table in EPOCH_TABLES:
+        await rebuild_with_epoch_timestamps(conn, table)
+
+MIGRATIONS = [
+    (1, "Indexes for hot lookups", [
+        'CREATE INDEX IF NOT EXISTS idx_drivers_yandex_driver_id ON drivers(yandex_driver_id)',
+        'CREATE INDEX IF NOT EXISTS idx_drivers_last_trip_date ON drivers(last_trip_date)',
+        'CREATE INDEX IF NOT EXISTS idx_documents_telegram_id ON documents(telegram_id, created_at)',
+        'CREATE INDEX IF NOT EXISTS idx_users_registration_status ON users(registration_status)',
+        'CREATE INDEX IF NOT EXISTS idx_transactions_created_at ON transactions(created_at)',
+    ]),
+    (2, "Indexes for filtered transaction pages", [
+        'CREATE INDEX IF NOT EXISTS idx_transactions_status_created_at ON transactions(status, created_at)',
+        'CREATE INDEX IF NOT EXISTS idx_transactions_telegram_id_created_at ON transactions(telegram_id, created_at)',
+    ]),
+    (3, "Trigger-maintained statistics counters", [
+        '''CREATE TABLE IF NOT EXISTS stats_counters (
+            name TEXT PRIMARY KEY,
+            value INTEGER NOT NULL DEFAULT 0
+        )''',
+        '''INSERT OR REPLACE INTO stats_counters (name, value) VALUES
+            ('users', (SELECT COUNT(*) FROM users)),
+            ('pending_registrations', (SELECT COUNT(*) FROM users WHERE registration_status = 'pending')),
+            ('drivers', (SELECT COUNT(*) FROM drivers)),
+            ('active_drivers', (SELECT COUNT(*) FROM drivers WHERE is_active = 1))''',
+        '''CREATE TRIGGER IF NOT EXISTS trg_users_insert_stats AFTER INSERT ON users BEGIN
+            UPDATE stats_counters SET value = value + 1 WHERE name = 'users';
+            UPDATE stats_counters SET value = value + 1
+                WHERE name = 'pending_registrations' AND new.registration_status = 'pending';
+        END''',
+        '''CREATE TRIGGER IF NOT EXISTS trg_users_delete_stats AFTER DELETE ON users BEGIN
+            UPDATE stats_counters SET value = value - 1 WHERE name = 'users';
+            UPDATE stats_counters SET value = value - 1
+                WHERE name = 'pending_registrations' AND old.registration_status = 'pending';
+        END''',
+        '''CREATE TRIGGER IF NOT EXISTS trg_users_status_stats AFTER UPDATE OF registration_status ON users
+            WHEN old.registration_status IS NOT new.registration_status BEGIN
+            UPDATE stats_counters
+                SET value = value + (new.registration_status IS 'pending') - (old.registration_status IS 'pending')
+                WHERE name = 'pending_registrations';
+        END''',
+        '''CREATE TRIGGER IF NOT EXISTS trg_drivers_insert_stats AFTER INSERT ON drivers BEGIN
+            UPDATE stats_counters SET value = value + 1 WHERE name = 'drivers';
+            UPDATE stats_counters SET value = value + 1 WHERE name = 'active_drivers' AND new.is_active = 1;
+        END''',
+        '''CREATE TRIGGER IF NOT EXISTS trg_drivers_delete_stats AFTER DELETE ON drivers BEGIN
+            UPDATE stats_counters SET value = value - 1 WHERE name = 'drivers';
+            UPDATE stats_counters SET value = value - 1 WHERE name = 'active_drivers' AND old.is_active = 1;
+        END''',
+        '''CREATE TRIGGER IF NOT EXISTS trg_drivers_active_stats AFTER UPDATE OF is_active ON drivers
+            WHEN old.is_active IS NOT new.is_active BEGIN
+            UPDATE stats_counters
+                SET value = value + (new.is_active IS 1) - (old.is_active IS 1)
+                WHERE name = 'active_drivers';
+        END''',
+    ]),
+    (4, "Full-text driver search with transliteration", [
+        '''CREATE VIRTUAL TABLE IF NOT EXISTS drivers_fts USING fts5(
+            name, callsign, car_model, yandex_driver_id, translit,
+            tokenize = 'unicode61 remove_diacritics 2',
+            prefix = '2 3'
+        )''',
+        '''INSERT INTO drivers_fts (rowid, name, callsign, car_model, yandex_driver_id, translit)
+            SELECT id, name, callsign, car_model, yandex_driver_id,
+                   translit(name, callsign, car_model, yandex_driver_id)
+            FROM drivers''',
+        '''CREATE TRIGGER IF NOT EXISTS trg_drivers_insert_fts AFTER INSERT ON drivers BEGIN
+            INSERT INTO drivers_fts (rowid, name, callsign, car_model, yandex_driver_id, translit)
+            VALUES (new.id, new.name, new.callsign, new.car_model, new.yandex_driver_id,
+                    translit(new.name, new.callsign, new.car_model, new.yandex_driver_id));
+        END''',
+        '''CREATE TRIGGER IF NOT EXISTS trg_drivers_delete_fts AFTER DELETE ON drivers BEGIN
+            DELETE FROM drivers_fts WHERE rowid = old.id;
+        END''',
+        '''CREATE TRIGGER IF NOT EXISTS trg_drivers_update_fts
+            AFTER UPDATE OF name, callsign, car_model, yandex_driver_id ON drivers BEGIN
+            DELETE FROM drivers_fts WHERE rowid = old.id;
+            INSERT INTO drivers_fts (rowid, name, callsign, car_model, yandex_driver_id, translit)
+            VALUES (new.id, new.name, new.callsign, new.car_model, new.yandex_driver_id,
+                    translit(new.name, new.callsign, new.car_model, new.yandex_driver_id));
+        END''',
+    ]),
+    (5, "Integer UTC epoch timestamps", [
+        convert_timestamps_to_epoch,
+    ]),
+    (6, "Daily rollups for archived rows", [
+        '''CREATE TABLE IF NOT EXISTS daily_rollups (
+            source TEXT NOT NULL,
+            day INTEGER NOT NULL,
+            kind TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT '',
+            count INTEGER NOT NULL DEFAULT 0,
+            amount REAL NOT NULL DEFAULT 0.0,
+            PRIMARY KEY (source, day, kind, status)
+        )''',
+    ]),
+    (7, "Persistent FSM storage", [
+        f'''CREATE TABLE IF NOT EXISTS fsm_storage (
+            key TEXT PRIMARY KEY,
+            state TEXT,
+            data TEXT NOT NULL DEFAULT '{{}}',
+            updated_at INTEGER DEFAULT ({EPOCH_NOW})
+        )''',
+    ]),
+    (8, "Driver profile hashes for change detection", [
+        'ALTER TABLE drivers ADD COLUMN profile_hash TEXT',
+    ]),
+    (9, "Driver activity markers for tiered refresh", [
+        'ALTER TABLE drivers ADD COLUMN last_seen_at INTEGER',
+        'ALTER TABLE drivers ADD COLUMN balance_changed_at INTEGER',
+        f'''CREATE TRIGGER IF NOT EXISTS trg_drivers_balance_changed AFTER UPDATE OF balance ON drivers
+            WHEN old.balance IS NOT new.balance AND old.profile_hash IS NOT NULL BEGIN
+            UPDATE drivers SET balance_changed_at = {EPOCH_NOW} WHERE id = new.id;
+        END''',
+    ]),
+    # No delete trigger: the only DELETE on transactions is the archive move, and archived
+    # rows still belong in the all-time totals.
+    (10, "Trigger-maintained transaction totals", [
+        '''CREATE TABLE IF NOT EXISTS transaction_totals (
+            status TEXT PRIMARY KEY,
+            count INTEGER NOT NULL DEFAULT 0,
+            amount REAL NOT NULL DEFAULT 0.0
+        )''',
+        '''INSERT OR REPLACE INTO transaction_totals (status, count, amount)
+            SELECT status, SUM(count), SUM(amount) FROM (
+                SELECT COALESCE(status, '') AS status, COUNT(*) AS count, COALESCE(SUM(amount), 0.0) AS amount
+                FROM transactions GROUP BY 1
+                UNION ALL
+                SELECT status, count, amount FROM daily_rollups WHERE source = 'transactions'
+            ) GROUP BY status''',
+        '''CREATE TRIGGER IF NOT EXISTS trg_transactions_insert_totals AFTER INSERT ON transactions BEGIN
+            INSERT INTO transaction_totals (status, count, amount) VALUES (COALESCE(new.status, ''), 1, new.amount)
+                ON CONFLICT (status) DO UPDATE SET count = count + 1, amount = amount + excluded.amount;
+        END''',
+        '''CREATE TRIGGER IF NOT EXISTS trg_transactions_update_totals AFTER UPDATE OF status, amount ON transactions
+            WHEN old.status IS NOT new.status OR old.amount IS NOT new.amount BEGIN
+            UPDATE transaction_totals SET count = count - 1, amount = amount - old.amount
+                WHERE status = COALESCE(old.status, '');
+            INSERT INTO transaction_totals (status, count, amount) VALUES (COALESCE(new.status, ''), 1, new.amount)
+                ON CONFLICT (status) DO UPDATE SET count = count + 1, amount = amount + excluded.amount;
+        END''',
+    ]),
+    # Seeded from last_sync, so every driver is due once, oldest first; each sync then schedules
+    # the next one from the driver's activity tier.
+    (11, "Persisted driver refresh schedule", [
+        'ALTER TABLE drivers ADD COLUMN next_refresh_at INTEGER NOT NULL DEFAULT 0',
+        'UPDATE drivers SET next_refresh_at = COALESCE(last_sync, 0)',
+        '''CREATE INDEX IF NOT EXISTS idx_drivers_next_refresh_at ON drivers(next_refresh_at)
+            WHERE yandex_driver_id IS NOT NULL''',
+    ]),
+    # UPDATE OF fires even when a sync writes the same value back, so reindex only on a real change.
+    (12, "Skip FTS reindex when searchable columns are unchanged", [
+        'DROP TRIGGER IF EXISTS trg_drivers_update_fts',
+        '''CREATE TRIGGER trg_drivers_update_fts
+            AFTER UPDATE OF name, callsign, car_model, yandex_driver_id ON drivers
+            WHEN old.name IS NOT new.name OR old.callsign IS NOT new.callsign
+              OR old.car_model IS NOT new.car_model OR old.yandex_driver_id IS NOT new.yandex_driver_id
+            BEGIN
+            DELETE FROM drivers_fts WHERE rowid = old.id;
+            INSERT INTO drivers_fts (rowid, name, callsign, car_model, yandex_driver_id, translit)
+            VALUES (new.id, new.name, new.callsign, new.car_model, new.yandex_driver_id,
+                    translit(new.name, new.callsign, new.car_model, new.yandex_driver_id));
+        END''',
+    ]),
+]
+
+async def get_schema_version(conn: aiosqlite.Connection) -> int:
+    cursor = await conn.execute('PRAGMA user_version')
+    row = await cursor.fetchone()
+    return row[0]
+
+async def run_migrations(conn: aiosqlite.Connection) -> int:
+    version = await get_schema_version(conn)
+
+    for target, description, steps in MIGRATIONS:
+        if target <= version:
+            continue
+
+        try:
+            await conn.execute('BEGIN')
+            for step in steps:
+                if callable(step):
+                    await step(conn)
+                else:
+                    await conn.execute(step)
+            await conn.execute(f'PRAGMA user_version = {target}')
+            await conn.commit()
+        except Exception as e:
+            await conn.rollback()
+            logger.error(f"Migration {target} ({description}) failed: {e}")
+            raise
+
+        version = target
+        logger.info(f"Applied migration {target}: {description}")
+
+    return version
@@ -1,8 +1,38 @@
-from dataclasses import dataclass
-from datetime import datetime
-from typing import Optional
+from dataclasses import dataclass, fields
+from datetime import datetime, timezone
+from typing import Optional, Sequence
 
-@dataclass
+def parse_timestamp(value) -> Optional[datetime]:
+    if value is None or isinstance(value, datetime):
+        return value
+    if isinstance(value, int):
+        return datetime.fromtimestamp(value, timezone.utc)
+    return datetime.fromisoformat(value)
+
+def to_epoch(value: datetime) -> int:
+    return int(value.timestamp())
+
+def row_model(cls):
+    cls = dataclass(slots=True)(cls)
+    cls.COLUMNS = tuple(f.name for f in fields(cls))
+    cls.TIMESTAMP_INDEXES = tuple(
+        i for i, f in enumerate(fields(cls)) if f.type == Optional[datetime]
+    )
+    return cls
+
+def from_row(model, row: Sequence):
+    if not model.TIMESTAMP_INDEXES:
+        return model(*row)
+
+    values = list(row)
+    for i in model.TIMESTAMP_INDEXES:
+        values[i] = parse_timestamp(values[i])
+    return model(*values)
+
+def select_columns(model, table: str) -> str:
+    return ", ".join(f"{table}.{column}" for column in model.COLUMNS)
+
+@row_model
 class User:
     telegram_id: int
     phone: Optional[str] = None
@@ -12,7 +42,7 @@ class User:
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
-@dataclass
+@row_model
 class Driver:
     id: Optional[int] = None
     telegram_id: int = 0
@@ -28,8 +58,12 @@ class Driver:
     last_manual_sync: Optional[datetime] = None
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
+    profile_hash: Optional[str] = None
+    last_seen_at: Optional[datetime] = None
+    balance_changed_at: Optional[datetime] = None
+    next_refresh_at: Optional[datetime] = None
 
-@dataclass
+@row_model
 class Document:
     id: Optional[int] = None
     telegram_id: int = 0
@@ -39,13 +73,13 @@ class Document:
     chat_id: Optional[int] = None
     created_at: Optional[datetime] = None
 
-@dataclass
+@row_model
 class BotSetting:
     key: str
     value: str
     updated_at: Optional[datetime] = None
 
-@dataclass
+@row_model
 class Transaction:
     id: Optional[int] = None
     telegram_id: int = 0
@@ -58,7 +92,7 @@ class Transaction:
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
-@dataclass
+@row_model
 class AdminAction:
     id: Optional[int] = None
     admin_id: int = 0
@@ -66,3 +100,11 @@ class AdminAction:
     target_id: int = 0
     reason: Optional[str] = None
     created_at: Optional[datetime] = None
+
+@row_model
+class StatsSnapshot:
+    total_users: int = 0
+    total_drivers: int = 0
+    pending_registrations: int = 0
+    active_drivers: int = 0
+    inactive_drivers: int = 0
@@ -2,13 +2,15 @@ import asyncio
 import logging
 import sys
 from aiogram import Bot, Dispatcher
-from aiogram.fsm.storage.memory import MemoryStorage
 
 from config import settings
 from database import db
 from bot.handlers import register_all_handlers
+from bot.middlewares import register_all_middlewares, last_seen_buffer
+from bot.storage import SQLiteStorage
 from services.scheduler import create_scheduler
 from services.queue_manager import queue_manager
+from services.yandex_api import yandex_api
 
 logging.basicConfig(
     level=logging.INFO,
@@ -30,11 +32,16 @@ async def main():
     logger.info("Starting 999 Taxi Bot...")
 
     await db.connect()
+    await yandex_api.start()
 
     bot = Bot(token=settings.BOT_TOKEN)
-    storage = MemoryStorage()
+    storage = SQLiteStorage(
+        flush_interval_ms=settings.FSM_FLUSH_INTERVAL_MS,
+        cache_size=settings.FSM_CACHE_SIZE
+    )
     dp = Dispatcher(storage=storage)
 
+    register_all_middlewares(dp)
     register_all_handlers(dp)
 
     scheduler = create_scheduler(bot)
@@ -49,6 +56,9 @@ async def main():
     finally:
         scheduler.stop()
         await queue_manager.stop()
+        await storage.close()
+        await last_seen_buffer.close()
+        await yandex_api.close()
         await db.close()
         await bot.session.close()
 
@@ -1,3 +1,3 @@
-from .yandex_api import YandexFleetAPI, sync_driver_data, sync_all_drivers
+from .yandex_api import YandexFleetAPI, yandex_api, sync_driver_data
 from .queue_manager import QueueManager
 from .scheduler import Scheduler
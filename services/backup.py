@@ -0,0 +1,121 @@
+import asyncio
+import gzip
+import logging
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from config import settings
+from database import db
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024
+
+@dataclass
+class BackupResult:
+    path: str
+    size: int
+    pages: int
+    duration: float
+    created_at: datetime
+
+class BackupEngine:
+    def __init__(self):
+        self.backup_dir = Path(settings.BACKUP_DIR)
+        self.retention = settings.BACKUP_RETENTION
+        self.compression = "zstd" if settings.BACKUP_COMPRESSION == "zstd" and zstandard else "gzip"
+        self._snapshot_path: Optional[Path] = None
+        self._source_size = 0
+        self.last_result: Optional[BackupResult] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._lock.locked()
+
+    def get_progress_percent(self) -> int:
+        # VACUUM INTO reports no progress, so compare the snapshot written so far with the source file.
+        if not self._snapshot_path or not self._source_size:
+            return 0
+        try:
+            written = self._snapshot_path.stat().st_size
+        except OSError:
+            return 0
+        return min(99, int(written * 100 / self._source_size))
+
+    async def create_backup(self) -> BackupResult:
+        async with self._lock:
+            started = time.monotonic()
+            self.backup_dir.mkdir(parents=True, exist_ok=True)
+
+            stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            raw_path = self.backup_dir / f"backup_{stamp}.db"
+            self._source_size = Path(db.db_path).stat().st_size
+            self._snapshot_path = raw_path
+
+            try:
+                pages = await db.snapshot_to(str(raw_path))
+                path = await asyncio.to_thread(self._compress, raw_path)
+            finally:
+                self._snapshot_path = None
+                raw_path.unlink(missing_ok=True)
+
+            result = BackupResult(
+                path=str(path),
+                size=path.stat().st_size,
+                pages=pages,
+                duration=time.monotonic() - started,
+                created_at=datetime.now()
+            )
+            self.last_result = result
+            self._apply_retention()
+
+            logger.info(
+                f"Database backed up to {result.path} "
+                f"({result.pages} pages, {result.size} bytes, {result.duration:.1f}s)"
+            )
+            return result
+
+    def _compress(self, raw_path: Path) -> Path:
+        if self.compression == "zstd":
+            path = raw_path.with_name(raw_path.name + ".zst")
+            compressor = zstandard.ZstdCompressor(level=10)
+            with open(raw_path, "rb") as src, open(path, "wb") as dst:
+                compressor.copy_stream(src, dst, read_size=CHUNK_SIZE)
+            return path
+
+        path = raw_path.with_name(raw_path.name + ".gz")
+        with open(raw_path, "rb") as src, gzip.open(path, "wb", compresslevel=6) as dst:
+            while True:
+                chunk = src.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                dst.write(chunk)
+        return path
+
+    def _apply_retention(self):
+        if self.retention <= 0:
+            return
+
+        backups = sorted(
+            (p for p in self.backup_dir.glob("backup_*.db.*") if p.suffix in (".gz", ".zst")),
+            key=lambda p: p.stat().st_mtime,
+            reverse=True
+        )
+        for old in backups[self.retention:]:
+            try:
+                os.remove(old)
+                logger.info(f"Removed old backup {old}")
+            except OSError as e:
+                logger.error(f"Error removing old backup {old}: {e}")
+
+backup_engine = BackupEngine()
@@ -0,0 +1,111 @@
+import asyncio
+import logging
+import time
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int = 1, min_rate: float = 0.5,
+                 increase: float = 0.1, decrease: float = 0.5):
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min(min_rate, rate)
+        self.increase = increase
+        self.decrease = decrease
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.acquired = 0
+        self.waits = 0
+        self.throttles = 0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    self.waits += 1
+                    await asyncio.sleep(self.blocked_until - now)
+                    continue
+
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    self.acquired += 1
+                    return
+
+                self.waits += 1
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def on_success(self):
+        if self.rate < self.max_rate:
+            self._refill(time.monotonic())
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_throttle(self, retry_after: Optional[float] = None):
+        now = time.monotonic()
+        self._refill(now)
+        self.throttles += 1
+        self.rate = max(self.min_rate, self.rate * self.decrease)
+        self.tokens = 0.0
+        if retry_after:
+            self.blocked_until = max(self.blocked_until, now + retry_after)
+
+    def as_dict(self) -> dict:
+        return {
+            "rate": round(self.rate, 2),
+            "max_rate": self.max_rate,
+            "acquired": self.acquired,
+            "waits": self.waits,
+            "throttles": self.throttles,
+        }
+
+class RateLimiter:
+    def __init__(self, default_rate: float, rates: Optional[Dict[str, float]] = None, burst: int = 1,
+                 min_rate: float = 0.5, increase: float = 0.1, decrease: float = 0.5):
+        self.default_rate = default_rate
+        self.rates = rates or {}
+        self.burst = burst
+        self.min_rate = min_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.buckets: Dict[str, TokenBucket] = {}
+
+    def bucket(self, endpoint: str) -> TokenBucket:
+        bucket = self.buckets.get(endpoint)
+        if bucket is None:
+            bucket = TokenBucket(
+                self.rates.get(endpoint, self.default_rate),
+                burst=self.burst,
+                min_rate=self.min_rate,
+                increase=self.increase,
+                decrease=self.decrease
+            )
+            self.buckets[endpoint] = bucket
+        return bucket
+
+    def as_dict(self) -> Dict[str, dict]:
+        return {endpoint: bucket.as_dict() for endpoint, bucket in self.buckets.items()}
+
+def parse_rates(value: str) -> Dict[str, float]:
+    rates = {}
+    for item in value.split(","):
+        endpoint, _, rate = item.strip().rpartition("=")
+        if endpoint and rate:
+            rates[endpoint.strip()] = float(rate)
+    return rates
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
@@ -0,0 +1,77 @@
+import logging
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+from config import settings
+from database import db
+
+logger = logging.getLogger(__name__)
+
+TIER_NAMES = ("active", "recent", "idle", "dormant")
+
+@dataclass
+class RefreshCycle:
+    started_at: datetime
+    planned: int = 0
+    requests: int = 0
+    updated: int = 0
+    duration: float = 0.0
+    tiers: Counter = field(default_factory=Counter)
+
+class RefreshPlanner:
+    def __init__(self):
+        self.request_budget = settings.REFRESH_REQUEST_BUDGET
+        self.batch_size = settings.YANDEX_SYNC_BATCH_SIZE
+        self.last_cycle: Optional[RefreshCycle] = None
+
+    @property
+    def tiers(self) -> List[Tuple[int, int]]:
+        return db.refresh_tiers
+
+    def tier_name(self, tier: int) -> str:
+        if tier == len(self.tiers) - 1:
+            return TIER_NAMES[-1]
+        return TIER_NAMES[tier] if tier < len(TIER_NAMES) - 1 else f"tier {tier}"
+
+    async def plan(self) -> List[Tuple[str, int]]:
+        return await db.get_refresh_candidates(self.request_budget * self.batch_size)
+
+    async def run_cycle(self) -> Optional[RefreshCycle]:
+        from services.yandex_api import yandex_api
+
+        if yandex_api.circuit_breaker.is_open:
+            logger.info("Refresh cycle skipped, Yandex circuit is open")
+            return None
+
+        started = time.monotonic()
+        cycle = RefreshCycle(started_at=datetime.now(timezone.utc))
+        candidates = await self.plan()
+        cycle.planned = len(candidates)
+        cycle.tiers.update(self.tier_name(tier) for _, tier in candidates)
+
+        if candidates:
+            cycle.requests = -(-len(candidates) // self.batch_size)
+            cycle.updated = await yandex_api.sync_drivers_batch(
+                [yandex_id for yandex_id, _ in candidates],
+                chunk_size=self.batch_size
+            )
+
+        cycle.duration = time.monotonic() - started
+        self.last_cycle = cycle
+        if candidates:
+            logger.info(
+                f"Refresh cycle: {cycle.planned} drivers due ({dict(cycle.tiers)}), "
+                f"{cycle.requests} requests, {cycle.updated} changed, {cycle.duration:.1f}s"
+            )
+        return cycle
+
+    def get_tier_intervals(self) -> List[Tuple[str, int]]:
+        return [(self.tier_name(tier), interval) for tier, (_, interval) in enumerate(self.tiers)]
+
+    async def count_due(self) -> int:
+        return await db.count_due_refreshes()
+
+refresh_planner = RefreshPlanner()
@@ -3,6 +3,7 @@ import logging
 from datetime import datetime, time
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 from aiogram import Bot
 
 from database import db
@@ -18,12 +19,20 @@ class Scheduler:
         self.bot = bot
 
     def start(self):
-        self.scheduler.add_job(
-            self.daily_sync_task,
-            CronTrigger(hour=0, minute=0, timezone="Asia/Tashkent"),
-            id="daily_sync",
-            replace_existing=True
-        )
+        if settings.REFRESH_CYCLE_SECONDS > 0:
+            self.scheduler.add_job(
+                self.refresh_cycle_task,
+                IntervalTrigger(seconds=settings.REFRESH_CYCLE_SECONDS),
+                id="refresh_cycle",
+                replace_existing=True
+            )
+        else:
+            self.scheduler.add_job(
+                self.daily_sync_task,
+                CronTrigger(hour=0, minute=0, timezone="Asia/Tashkent"),
+                id="daily_sync",
+                replace_existing=True
+            )
 
         self.scheduler.add_job(
             self.check_inactive_drivers_task,
@@ -32,41 +41,53 @@ class Scheduler:
             replace_existing=True
         )
 
+        if settings.BACKUP_SCHEDULE_HOUR >= 0:
+            self.scheduler.add_job(
+                self.backup_task,
+                CronTrigger(hour=settings.BACKUP_SCHEDULE_HOUR, minute=30, timezone="Asia/Tashkent"),
+                id="database_backup",
+                replace_existing=True
+            )
+
+        if settings.RETENTION_SCHEDULE_HOUR >= 0:
+            self.scheduler.add_job(
+                self.retention_task,
+                CronTrigger(hour=settings.RETENTION_SCHEDULE_HOUR, minute=0, timezone="Asia/Tashkent"),
+                id="retention",
+                replace_existing=True
+            )
+
         self.scheduler.start()
         logger.info("Scheduler started")
 
     async def daily_sync_task(self):
         logger.info("Starting daily sync task")
 
-        from services.yandex_api import sync_all_drivers
-        from services.queue_manager import queue_manager
+        from services.yandex_api import yandex_api
 
         try:
-            drivers = await db.get_all_drivers()
-
-            for driver in drivers:
-                if driver.yandex_driver_id:
-                    await queue_manager.add_task(self._sync_single_driver, driver.telegram_id)
+            yandex_ids = [driver.yandex_driver_id async for driver in db.iter_drivers("linked")]
+            updated = await yandex_api.sync_drivers_batch(yandex_ids)
 
-            logger.info(f"Scheduled sync for {len(drivers)} drivers")
+            logger.info(f"Daily sync updated {updated} of {len(yandex_ids)} linked drivers")
         except Exception as e:
             logger.error(f"Error in daily sync task: {e}")
 
-    async def _sync_single_driver(self, telegram_id: int):
-        from services.yandex_api import sync_driver_data
+    async def refresh_cycle_task(self):
+        from services.refresh_planner import refresh_planner
 
         try:
-            await sync_driver_data(telegram_id)
+            await refresh_planner.run_cycle()
         except Exception as e:
-            logger.error(f"Error syncing driver {telegram_id}: {e}")
+            logger.error(f"Error in refresh cycle: {e}")
 
     async def check_inactive_drivers_task(self):
         logger.info("Starting inactive drivers check")
 
         try:
-            inactive_drivers = await db.get_inactive_drivers(days=7)
+            sent = 0
 
-            for driver in inactive_drivers:
+            async for driver in db.iter_drivers("inactive", days=7):
                 try:
                     user = await db.get_user(driver.telegram_id)
                     if not user:
@@ -80,14 +101,42 @@ class Scheduler:
                         reply_markup=get_inactive_check_keyboard(lang)
                     )
 
+                    sent += 1
                     logger.info(f"Sent inactive check to driver {driver.telegram_id}")
                 except Exception as e:
                     logger.error(f"Error sending inactive check to {driver.telegram_id}: {e}")
 
-            logger.info(f"Inactive check sent to {len(inactive_drivers)} drivers")
+            logger.info(f"Inactive check sent to {sent} drivers")
         except Exception as e:
             logger.error(f"Error in inactive drivers check: {e}")
 
+    async def backup_task(self):
+        logger.info("Starting scheduled database backup")
+
+        from services.backup import backup_engine
+
+        try:
+            await backup_engine.create_backup()
+        except Exception as e:
+            logger.error(f"Error in scheduled backup: {e}")
+
+    async def retention_task(self):
+        logger.info("Starting retention task")
+
+        policies = {
+            "transactions": settings.TRANSACTIONS_RETENTION_DAYS,
+            "admin_actions": settings.ADMIN_ACTIONS_RETENTION_DAYS,
+        }
+
+        for table, days in policies.items():
+            if days <= 0:
+                continue
+            try:
+                moved = await db.archive_old_rows(table, days, batch_size=settings.RETENTION_BATCH_SIZE)
+                logger.info(f"Retention moved {moved} {table} rows to the archive")
+            except Exception as e:
+                logger.error(f"Error archiving {table}: {e}")
+
     def stop(self):
         self.scheduler.shutdown()
         logger.info("Scheduler stopped")
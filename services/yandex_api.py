@@ -1,15 +1,90 @@
 import aiohttp
 import asyncio
+import hashlib
+import json
 import logging
-from typing import Optional, Dict, List
+from collections import Counter
+from typing import Optional, Dict, List, Tuple
 from datetime import datetime, timedelta, timezone
 from dateutil import parser
 
 from config import settings
 from database import db
+from database.cache import LRUTTLCache
+from database.models import Driver
+from services.circuit_breaker import CircuitBreaker
+from services.rate_limiter import RateLimiter, parse_rates, parse_retry_after
 
 logger = logging.getLogger(__name__)
 
+PROFILES_ENDPOINT = "parks/driver-profiles/list"
+ACTIVITY_WATERMARK_KEY = "sync_activity_watermark"
+
+SYNC_FIELDS = {
+    "driver_profile": ["id", "first_name", "last_name", "phones"],
+    "car": ["brand", "model", "callsign"],
+    "accounts": ["balance", "last_transaction_date"],
+}
+
+HASHED_FIELDS = ("name", "callsign", "car_model", "balance", "last_trip_date", "last_trip_sum", "is_active")
+
+def profile_hash(driver_data: dict) -> str:
+    payload = json.dumps([driver_data.get(field) for field in HASHED_FIELDS], default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=8).hexdigest()
+
+def active_refresh_interval() -> timedelta:
+    # A profile that just changed, or a driver using the bot, is treated as active.
+    return timedelta(seconds=db.refresh_tiers[0][1])
+
+def data_age(driver: Driver) -> Optional[float]:
+    # Only a sync makes the data fresh; updated_at also moves on local edits and on creation.
+    if driver.last_sync is None:
+        return None
+    return (datetime.now(timezone.utc) - driver.last_sync).total_seconds()
+
+class ConnectionStats:
+    def __init__(self):
+        self.requests = 0
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.dns_cache_hits = 0
+        self.dns_cache_misses = 0
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        trace = aiohttp.TraceConfig()
+        trace.on_request_start.append(self._on_request_start)
+        trace.on_connection_create_end.append(self._on_connection_create_end)
+        trace.on_connection_reuseconn.append(self._on_connection_reuseconn)
+        trace.on_dns_cache_hit.append(self._on_dns_cache_hit)
+        trace.on_dns_cache_miss.append(self._on_dns_cache_miss)
+        return trace
+
+    async def _on_request_start(self, session, context, params):
+        self.requests += 1
+
+    async def _on_connection_create_end(self, session, context, params):
+        self.connections_created += 1
+
+    async def _on_connection_reuseconn(self, session, context, params):
+        self.connections_reused += 1
+
+    async def _on_dns_cache_hit(self, session, context, params):
+        self.dns_cache_hits += 1
+
+    async def _on_dns_cache_miss(self, session, context, params):
+        self.dns_cache_misses += 1
+
+    def as_dict(self) -> dict:
+        connections = self.connections_created + self.connections_reused
+        return {
+            "requests": self.requests,
+            "connections_created": self.connections_created,
+            "connections_reused": self.connections_reused,
+            "reuse_ratio": round(self.connections_reused / connections, 3) if connections else 0.0,
+            "dns_cache_hits": self.dns_cache_hits,
+            "dns_cache_misses": self.dns_cache_misses,
+        }
+
 class YandexFleetAPI:
     def __init__(self):
         self.base_url = settings.YANDEX_API_URL
@@ -17,6 +92,60 @@ class YandexFleetAPI:
         self.client_id = settings.YANDEX_CLIENT_ID
         self.api_key = settings.YANDEX_API_KEY
         self._refresh_lock = asyncio.Lock()
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.connection_stats = ConnectionStats()
+        self.rate_limiter = RateLimiter(
+            settings.YANDEX_RATE_LIMIT,
+            rates=parse_rates(settings.YANDEX_RATE_LIMITS),
+            burst=settings.YANDEX_RATE_BURST,
+            min_rate=settings.YANDEX_RATE_MIN,
+            increase=settings.YANDEX_RATE_INCREASE,
+            decrease=settings.YANDEX_RATE_DECREASE
+        )
+        self.refresh_cache = LRUTTLCache(
+            maxsize=settings.YANDEX_REFRESH_CACHE_SIZE,
+            ttl=settings.YANDEX_REFRESH_CACHE_TTL
+        )
+        self.refresh_stats = Counter()
+        self._driver_refreshes: Dict[int, asyncio.Task] = {}
+        self._revalidations = set()
+        self.circuit_breaker = CircuitBreaker(
+            "yandex",
+            failure_threshold=settings.YANDEX_BREAKER_FAILURES,
+            reset_timeout=settings.YANDEX_BREAKER_RESET_SECONDS
+        )
+
+    async def start(self):
+        if self.session and not self.session.closed:
+            return
+
+        connector = aiohttp.TCPConnector(
+            limit=settings.YANDEX_HTTP_POOL_SIZE,
+            limit_per_host=settings.YANDEX_HTTP_POOL_SIZE_PER_HOST,
+            keepalive_timeout=settings.YANDEX_HTTP_KEEPALIVE_TIMEOUT,
+            ttl_dns_cache=settings.YANDEX_HTTP_DNS_CACHE_TTL,
+            enable_cleanup_closed=True
+        )
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=40),
+            trace_configs=[self.connection_stats.trace_config()]
+        )
+        logger.info("Yandex Fleet API session opened")
+
+    async def close(self):
+        if self.session and not self.session.closed:
+            await self.session.close()
+            logger.info("Yandex Fleet API session closed")
+        self.session = None
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        if not self.session or self.session.closed:
+            await self.start()
+        return self.session
+
+    def get_connection_stats(self) -> dict:
+        return self.connection_stats.as_dict()
 
     def get_auth_headers(self) -> Dict[str, str]:
         return {
@@ -59,21 +188,156 @@ class YandexFleetAPI:
             "is_active": True,
         }
 
+    async def _request(self, endpoint: str, body: dict, timeout: Optional[float] = None,
+                       max_retries: int = 6) -> dict:
+        self.circuit_breaker.before_call()
+        bucket = self.rate_limiter.bucket(endpoint)
+        session = await self.get_session()
+        url = f"{self.base_url}/{endpoint}"
+        # Passing timeout=None would disable the session's default timeout, so only override when given.
+        options = {"timeout": aiohttp.ClientTimeout(total=timeout)} if timeout else {}
+        retries = 0
+
+        while True:
+            await bucket.acquire()
+            try:
+                async with session.post(url, headers=self.get_auth_headers(), json=body, **options) as resp:
+                    if resp.status >= 500:
+                        self.circuit_breaker.on_failure()
+                        resp.raise_for_status()
+                    self.circuit_breaker.on_success()
+
+                    if resp.status == 429:
+                        retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+                        bucket.on_throttle(retry_after)
+                        retries += 1
+                        if retries > max_retries:
+                            raise RuntimeError(f"{endpoint}: hit 429 too many times")
+                        logger.warning(
+                            f"Rate limited (429) on {endpoint}, rate now {bucket.rate:.2f}/s "
+                            f"(retry {retries}/{max_retries})"
+                        )
+                        continue
+
+                    resp.raise_for_status()
+                    bucket.on_success()
+                    return await resp.json()
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                self.circuit_breaker.on_failure()
+                raise
+
+    async def _write_changed(self, rows: List[dict], hashes: Dict[str, Optional[str]], summary: Counter,
+                             watermark: Optional[Tuple[str, str]] = None) -> int:
+        synced_at = datetime.now(timezone.utc)
+        next_refresh_at = synced_at + active_refresh_interval()
+        changed = []
+        unchanged = []
+        for row in rows:
+            digest = profile_hash(row)
+            if hashes.get(row["yandex_driver_id"]) == digest:
+                unchanged.append(row["yandex_driver_id"])
+                continue
+            changed.append(dict(row, profile_hash=digest, last_sync=synced_at, next_refresh_at=next_refresh_at))
+
+        updated = await db.upsert_drivers_many(changed, watermark=watermark)
+        # Unchanged profiles were still confirmed just now, so only their sync time moves.
+        await db.touch_drivers_synced(unchanged, synced_at)
+        summary["changed"] += updated
+        summary["unchanged"] += len(unchanged)
+        return updated
+
+    async def refresh_driver(self, telegram_id: int, manual: bool = False) -> bool:
+        self.refresh_stats["requests"] += 1
+        if self.refresh_cache.get(telegram_id):
+            refreshed = True
+        else:
+            task = self._driver_refreshes.get(telegram_id)
+            if task is None:
+                task = asyncio.create_task(self._sync_driver(telegram_id))
+                self._driver_refreshes[telegram_id] = task
+                task.add_done_callback(lambda _: self._driver_refreshes.pop(telegram_id, None))
+            else:
+                self.refresh_stats["coalesced"] += 1
+            refreshed = await asyncio.shield(task)
+
+        # Only an explicit "update info" request uses up the driver's hourly allowance.
+        if refreshed and manual:
+            await db.update_driver(telegram_id, last_manual_sync=datetime.now(timezone.utc))
+        return refreshed
+
+    async def _sync_driver(self, telegram_id: int) -> bool:
+        driver = await db.get_driver(telegram_id)
+
+        if not driver or not driver.yandex_driver_id:
+            logger.warning(f"Driver {telegram_id} not found or no Yandex ID")
+            return False
+
+        try:
+            body = {
+                "fields": SYNC_FIELDS,
+                "query": {
+                    "park": {
+                        "id": self.park_id,
+                        "driver_profile": {
+                            "id": driver.yandex_driver_id
+                        }
+                    }
+                },
+            }
+
+            data = await self._request(PROFILES_ENDPOINT, body, timeout=30)
+            profiles = data.get("driver_profiles") or []
+
+            if not profiles:
+                logger.error(f"No profile found for driver {telegram_id}")
+                return False
+
+            driver_data = self._normalize_driver(profiles[0])
+            driver_data["profile_hash"] = profile_hash(driver_data)
+            driver_data["last_sync"] = datetime.now(timezone.utc)
+            driver_data["next_refresh_at"] = driver_data["last_sync"] + active_refresh_interval()
+
+            await db.update_driver(telegram_id, **driver_data)
+            self.refresh_stats["fetched"] += 1
+            self.refresh_cache.set(telegram_id, True)
+            logger.info(f"Driver {telegram_id} data synced successfully")
+            return True
+        except Exception as e:
+            logger.error(f"Error syncing driver data: {e}")
+            return False
+
+    def revalidate_driver(self, driver: Driver, force: bool = False, manual: bool = False) -> Optional[asyncio.Task]:
+        if not driver.yandex_driver_id:
+            return None
+        age = data_age(driver)
+        if not force and age is not None and age < settings.YANDEX_STALE_AFTER_SECONDS:
+            return None
+        if self.circuit_breaker.is_open:
+            return None
+
+        task = asyncio.create_task(self.refresh_driver(driver.telegram_id, manual=manual))
+        self._revalidations.add(task)
+        task.add_done_callback(self._revalidations.discard)
+        return task
+
+    def get_refresh_stats(self) -> dict:
+        return {
+            "requests": self.refresh_stats["requests"],
+            "cache_hits": self.refresh_cache.hits,
+            "coalesced": self.refresh_stats["coalesced"],
+            "fetched": self.refresh_stats["fetched"],
+        }
+
+    def get_rate_limit_stats(self) -> dict:
+        return self.rate_limiter.as_dict()
+
     async def fetch_all_drivers(self, notify_channel=False, bot=None) -> int:
         async with self._refresh_lock:
             try:
                 logger.info("Fetching ALL drivers from Yandex API...")
-                offset = 0
                 limit = 1000
                 total = 0
 
-                retries = 0
-                max_retries = 6
-                backoff_base = 1.5
-
-                url = f"{self.base_url}/parks/driver-profiles/list"
-                headers = self.get_auth_headers()
-
                 base_query = {
                     "fields": {
                         "driver_profile": ["id", "first_name", "last_name", "phones", "work_status"],
@@ -82,66 +346,60 @@ class YandexFleetAPI:
                         "current_status": ["status"],
                     },
                     "query": {"park": {"id": self.park_id}},
+                    "sort_order": [{"field": "driver_profile.created_date", "direction": "desc"}],
+                    "limit": limit,
                 }
 
-                async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=40)) as session:
+                pages: asyncio.Queue = asyncio.Queue(maxsize=settings.YANDEX_PAGE_QUEUE_SIZE)
+                hashes = await db.get_profile_hashes()
+                summary = Counter()
+
+                async def fetch(offset: int) -> dict:
+                    return await self._request(PROFILES_ENDPOINT, dict(base_query, offset=offset))
+
+                async def writer() -> int:
+                    written = 0
                     while True:
-                        body = dict(base_query)
-                        body.update({
-                            "limit": limit,
-                            "offset": offset,
-                            "sort_order": [{"field": "driver_profile.created_date", "direction": "desc"}],
-                        })
+                        profiles = await pages.get()
+                        if profiles is None:
+                            return written
+
+                        page = []
+                        for pr in profiles:
+                            driver_data = self._normalize_driver(pr)
+                            if driver_data.get("yandex_driver_id"):
+                                page.append(driver_data)
 
                         try:
-                            async with session.post(url, headers=headers, json=body) as resp:
-                                if resp.status == 429:
-                                    retry_after = resp.headers.get("Retry-After")
-                                    if retry_after:
-                                        delay = float(retry_after)
-                                    else:
-                                        delay = min(60, backoff_base ** retries) + (0.25 * (retries + 1))
-                                    retries += 1
-                                    if retries > max_retries:
-                                        logger.error("Hit 429 too many times; aborting refresh")
-                                        break
-                                    logger.warning(
-                                        f"Rate limited (429). Sleeping {delay:.2f}s before retry (try {retries}/{max_retries})"
-                                    )
-                                    await asyncio.sleep(delay)
-                                    continue
-
-                                resp.raise_for_status()
-                                data = await resp.json()
-                                profiles = data.get("driver_profiles") or []
-                                if not profiles:
-                                    break
-
-                                for pr in profiles:
-                                    driver_data = self._normalize_driver(pr)
-
-                                    yandex_id = driver_data.get("yandex_driver_id")
-                                    if not yandex_id:
-                                        continue
-
-                                    existing_driver = await db.get_driver_by_yandex_id(yandex_id)
-                                    if existing_driver:
-                                        await db.update_driver(existing_driver.telegram_id, **driver_data)
-                                    total += 1
-
-                                logger.info(f"Fetched {len(profiles)} drivers (offset={offset})")
-
-                                if len(profiles) < limit:
-                                    break
-
-                                offset += len(profiles)
-                                retries = 0
-                                await asyncio.sleep(0.5)
+                            await self._write_changed(page, hashes, summary)
+                            written += len(page)
                         except Exception as e:
-                            logger.error(f"Request error: {e}")
-                            break
+                            logger.error(f"Error writing driver page: {e}")
 
-                msg = f"✅ Full refresh completed. {total} drivers synced."
+                writer_task = asyncio.create_task(writer())
+                try:
+                    try:
+                        first = await fetch(0)
+                    except Exception as e:
+                        logger.error(f"Request error: {e}")
+                        first = {}
+
+                    profiles = first.get("driver_profiles") or []
+                    park_total = first.get("total")
+                    await pages.put(profiles)
+                    logger.info(f"Fetched {len(profiles)} drivers (offset=0, total={park_total})")
+
+                    if profiles and len(profiles) == limit:
+                        if park_total is not None and settings.YANDEX_FETCH_CONCURRENCY > 1:
+                            await self._fetch_pages_concurrently(fetch, pages, range(limit, park_total, limit))
+                        else:
+                            await self._fetch_pages_sequentially(fetch, pages, limit)
+                finally:
+                    await pages.put(None)
+                    total = await writer_task
+
+                msg = (f"✅ Full refresh completed. {total} drivers synced "
+                       f"({summary['changed']} changed, {summary['unchanged']} unchanged).")
                 logger.info(msg)
 
                 if notify_channel and bot:
@@ -157,6 +415,41 @@ class YandexFleetAPI:
                 logger.error(f"Error fetching all drivers: {e}")
                 return 0
 
+    async def _fetch_pages_concurrently(self, fetch, pages: asyncio.Queue, offsets: range):
+        semaphore = asyncio.Semaphore(settings.YANDEX_FETCH_CONCURRENCY)
+
+        async def fetch_into_queue(offset: int):
+            async with semaphore:
+                try:
+                    data = await fetch(offset)
+                except Exception as e:
+                    logger.error(f"Request error (offset={offset}): {e}")
+                    return
+            profiles = data.get("driver_profiles") or []
+            await pages.put(profiles)
+            logger.info(f"Fetched {len(profiles)} drivers (offset={offset})")
+
+        await asyncio.gather(*(fetch_into_queue(offset) for offset in offsets))
+
+    async def _fetch_pages_sequentially(self, fetch, pages: asyncio.Queue, limit: int):
+        offset = limit
+        while True:
+            try:
+                data = await fetch(offset)
+            except Exception as e:
+                logger.error(f"Request error: {e}")
+                return
+
+            profiles = data.get("driver_profiles") or []
+            if not profiles:
+                return
+            await pages.put(profiles)
+            logger.info(f"Fetched {len(profiles)} drivers (offset={offset})")
+
+            if len(profiles) < limit:
+                return
+            offset += len(profiles)
+
     async def fetch_recent_drivers(self, days: int, notify_channel=True, bot=None) -> int:
         async with self._refresh_lock:
             try:
@@ -165,9 +458,8 @@ class YandexFleetAPI:
                 offset = 0
                 limit = 1000
                 total = 0
-
-                url = f"{self.base_url}/parks/driver-profiles/list"
-                headers = self.get_auth_headers()
+                hashes = await db.get_profile_hashes()
+                summary = Counter()
 
                 base_query = {
                     "fields": {
@@ -178,56 +470,53 @@ class YandexFleetAPI:
                     "query": {"park": {"id": self.park_id}},
                 }
 
-                async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=40)) as session:
-                    while True:
-                        body = dict(base_query)
-                        body.update({
-                            "limit": limit,
-                            "offset": offset,
-                            "sort_order": [{"field": "driver_profile.created_date", "direction": "desc"}],
-                        })
+                while True:
+                    body = dict(base_query)
+                    body.update({
+                        "limit": limit,
+                        "offset": offset,
+                        "sort_order": [{"field": "driver_profile.created_date", "direction": "desc"}],
+                    })
 
-                        try:
-                            async with session.post(url, headers=headers, json=body) as resp:
-                                resp.raise_for_status()
-                                data = await resp.json()
-                                profiles = data.get("driver_profiles") or []
-                                if not profiles:
-                                    break
-
-                                oldest_in_page = None
-                                for pr in profiles:
-                                    dp = pr.get("driver_profile") or {}
-                                    ts = dp.get("created_date")
-                                    if not ts:
-                                        continue
-                                    try:
-                                        ts_dt = datetime.fromisoformat(ts.replace("Z", "+00:00"))
-                                    except Exception:
-                                        ts_dt = parser.isoparse(ts)
-                                    if oldest_in_page is None or ts_dt < oldest_in_page:
-                                        oldest_in_page = ts_dt
-                                    if ts_dt >= since:
-                                        driver_data = self._normalize_driver(pr)
-                                        yandex_id = driver_data.get("yandex_driver_id")
-                                        if yandex_id:
-                                            existing_driver = await db.get_driver_by_yandex_id(yandex_id)
-                                            if existing_driver:
-                                                await db.update_driver(existing_driver.telegram_id, **driver_data)
-                                        total += 1
-
-                                if oldest_in_page and oldest_in_page < since:
-                                    break
-                                if len(profiles) < limit:
-                                    break
-                                offset += len(profiles)
-                                await asyncio.sleep(0.5)
-                        except Exception as e:
-                            logger.error(f"Error fetching recent drivers: {e}")
+                    try:
+                        data = await self._request(PROFILES_ENDPOINT, body)
+                        profiles = data.get("driver_profiles") or []
+                        if not profiles:
+                            break
+
+                        oldest_in_page = None
+                        page = []
+                        for pr in profiles:
+                            dp = pr.get("driver_profile") or {}
+                            ts = dp.get("created_date")
+                            if not ts:
+                                continue
+                            try:
+                                ts_dt = datetime.fromisoformat(ts.replace("Z", "+00:00"))
+                            except Exception:
+                                ts_dt = parser.isoparse(ts)
+                            if oldest_in_page is None or ts_dt < oldest_in_page:
+                                oldest_in_page = ts_dt
+                            if ts_dt >= since:
+                                driver_data = self._normalize_driver(pr)
+                                if driver_data.get("yandex_driver_id"):
+                                    page.append(driver_data)
+                                total += 1
+
+                        await self._write_changed(page, hashes, summary)
+
+                        if oldest_in_page and oldest_in_page < since:
                             break
+                        if len(profiles) < limit:
+                            break
+                        offset += len(profiles)
+                    except Exception as e:
+                        logger.error(f"Error fetching recent drivers: {e}")
+                        break
 
                 total_in_db = await db.get_driver_count()
-                msg = f"✅ Recent refresh completed. {total} drivers (last {days} days) synced. Total in DB: {total_in_db}"
+                msg = (f"✅ Recent refresh completed. {total} drivers (last {days} days) synced "
+                       f"({summary['changed']} changed, {summary['unchanged']} unchanged). Total in DB: {total_in_db}")
                 logger.info(msg)
 
                 if notify_channel and bot:
@@ -243,6 +532,111 @@ class YandexFleetAPI:
                 logger.error(f"Error fetching recent drivers: {e}")
                 return 0
 
+    async def fetch_active_drivers(self, notify_channel=True, bot=None) -> int:
+        async with self._refresh_lock:
+            try:
+                stored = await db.get_setting(ACTIVITY_WATERMARK_KEY)
+                watermark = datetime.fromisoformat(stored) if stored else datetime.now(timezone.utc) - timedelta(days=1)
+                since = watermark - timedelta(seconds=settings.YANDEX_WATERMARK_OVERLAP_SECONDS)
+                logger.info(f"Starting incremental refresh since {since.isoformat()}...")
+
+                body = {
+                    "fields": SYNC_FIELDS,
+                    "query": {
+                        "park": {
+                            "id": self.park_id,
+                            "account": {"last_transaction_date": {"from": since.isoformat()}},
+                        }
+                    },
+                    "sort_order": [{"field": "driver_profile.created_date", "direction": "desc"}],
+                }
+
+                rows = []
+                offset = 0
+                limit = 1000
+                complete = False
+                newest = watermark
+                while True:
+                    try:
+                        data = await self._request(PROFILES_ENDPOINT, dict(body, limit=limit, offset=offset))
+                    except Exception as e:
+                        logger.error(f"Error fetching active drivers: {e}")
+                        break
+
+                    profiles = data.get("driver_profiles") or []
+                    for profile in profiles:
+                        driver_data = self._normalize_driver(profile)
+                        last_activity = driver_data["last_trip_date"]
+                        if not driver_data.get("yandex_driver_id") or not last_activity or last_activity < since:
+                            continue
+                        rows.append(driver_data)
+                        newest = max(newest, last_activity)
+
+                    if len(profiles) < limit:
+                        complete = True
+                        break
+                    offset += len(profiles)
+
+                summary = Counter()
+                advance = (ACTIVITY_WATERMARK_KEY, newest.isoformat()) if complete else None
+                await self._write_changed(rows, await db.get_profile_hashes(), summary, watermark=advance)
+
+                msg = (f"✅ Incremental refresh completed. {len(rows)} active drivers synced "
+                       f"({summary['changed']} changed, {summary['unchanged']} unchanged).")
+                logger.info(msg)
+                if not complete:
+                    logger.warning(f"Incremental refresh incomplete, watermark kept at {watermark.isoformat()}")
+
+                if notify_channel and bot:
+                    try:
+                        update_channel_id = await db.get_setting("update_info_channel_id")
+                        if update_channel_id:
+                            await bot.send_message(chat_id=int(update_channel_id), text=msg)
+                    except Exception as e:
+                        logger.error(f"Error sending notification: {e}")
+
+                return len(rows)
+            except Exception as e:
+                logger.error(f"Error in incremental refresh: {e}")
+                return 0
+
+    async def sync_drivers_batch(self, yandex_ids: List[str], chunk_size: Optional[int] = None) -> int:
+        chunk_size = chunk_size or settings.YANDEX_SYNC_BATCH_SIZE
+        yandex_ids = list(dict.fromkeys(i for i in yandex_ids if i))
+
+        rows = []
+        checked = []
+        for i in range(0, len(yandex_ids), chunk_size):
+            chunk = yandex_ids[i:i + chunk_size]
+            body = {
+                "fields": SYNC_FIELDS,
+                "query": {"park": {"id": self.park_id, "driver_profile": {"id": chunk}}},
+                "limit": len(chunk),
+            }
+
+            try:
+                data = await self._request(PROFILES_ENDPOINT, body)
+            except Exception as e:
+                logger.error(f"Error syncing driver batch {i // chunk_size + 1}: {e}")
+                continue
+
+            checked.extend(chunk)
+            for profile in data.get("driver_profiles") or []:
+                driver_data = self._normalize_driver(profile)
+                if driver_data.get("yandex_driver_id"):
+                    rows.append(driver_data)
+
+        summary = Counter()
+        returned = {row["yandex_driver_id"] for row in rows}
+        updated = await self._write_changed(rows, await db.get_profile_hashes(list(returned)), summary)
+        # Drivers Yandex did not return keep their last_sync but are rescheduled, so they cannot hog the budget.
+        await db.postpone_driver_refresh([i for i in checked if i not in returned], datetime.now(timezone.utc))
+        logger.info(
+            f"Batch sync: {len(yandex_ids)} drivers requested, {len(rows)} returned, "
+            f"{summary['changed']} changed, {summary['unchanged']} unchanged"
+        )
+        return updated
+
     async def auto_refresh(self, context):
         last_full_refresh = None
 
@@ -263,10 +657,10 @@ class YandexFleetAPI:
                     except Exception:
                         pass
 
-                logger.info("⏳ Running scheduled RECENT refresh (last 1 day)...")
-                total = await self.fetch_recent_drivers(1, bot=context.bot)
+                logger.info("⏳ Running scheduled INCREMENTAL refresh...")
+                total = await self.fetch_active_drivers(bot=context.bot)
 
-                msg = f"🔄 Recent refresh finished.\n✅ Synced {total} drivers (last 24h).\n📅 {now.strftime('%Y-%m-%d %H:%M:%S')}"
+                msg = f"🔄 Incremental refresh finished.\n✅ Synced {total} active drivers.\n📅 {now.strftime('%Y-%m-%d %H:%M:%S')}"
                 try:
                     update_channel_id = await db.get_setting("update_info_channel_id")
                     if update_channel_id:
@@ -291,49 +685,4 @@ class YandexFleetAPI:
 yandex_api = YandexFleetAPI()
 
 async def sync_driver_data(telegram_id: int) -> bool:
-    driver = await db.get_driver(telegram_id)
-
-    if not driver or not driver.yandex_driver_id:
-        logger.warning(f"Driver {telegram_id} not found or no Yandex ID")
-        return False
-
-    try:
-        url = f"{yandex_api.base_url}/parks/driver-profiles/list"
-        headers = yandex_api.get_auth_headers()
-
-        body = {
-            "fields": {
-                "driver_profile": ["id", "first_name", "last_name", "phones"],
-                "car": ["brand", "model", "callsign"],
-                "accounts": ["balance", "last_transaction_date"],
-            },
-            "query": {
-                "park": {
-                    "id": yandex_api.park_id,
-                    "driver_profile": {
-                        "id": driver.yandex_driver_id
-                    }
-                }
-            },
-        }
-
-        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30)) as session:
-            async with session.post(url, headers=headers, json=body) as resp:
-                resp.raise_for_status()
-                data = await resp.json()
-                profiles = data.get("driver_profiles") or []
-
-                if not profiles:
-                    logger.error(f"No profile found for driver {telegram_id}")
-                    return False
-
-                driver_data = yandex_api._normalize_driver(profiles[0])
-                driver_data["last_sync"] = datetime.now()
-                driver_data["last_manual_sync"] = datetime.now()
-
-                await db.update_driver(telegram_id, **driver_data)
-                logger.info(f"Driver {telegram_id} data synced successfully")
-                return True
-    except Exception as e:
-        logger.error(f"Error syncing driver data: {e}")
-        return False
+    return await yandex_api.refresh_driver(telegram_id, manual=True)
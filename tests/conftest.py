@@ -0,0 +1,76 @@
+import asyncio
+import importlib
+import socket
+
+import pytest
+
+from config import settings
+from database import Database
+from services.yandex_api import YandexFleetAPI
+from tools.yandex_simulator import YandexSimulator
+
+DB_MODULES = (
+    "database",
+    "services.yandex_api",
+    "services.refresh_planner",
+    "services.backup",
+    "services.scheduler",
+    "bot.storage",
+    "bot.middlewares.user_context",
+    "bot.handlers.start",
+    "bot.handlers.registration",
+    "bot.handlers.driver",
+    "bot.handlers.admin",
+    "bot.handlers.developer",
+    "bot.handlers.callbacks",
+)
+
+@pytest.fixture
+def fresh_db(tmp_path, monkeypatch):
+    database = Database()
+    database.db_path = str(tmp_path / "taxi_bot.db")
+    for name in DB_MODULES:
+        monkeypatch.setattr(importlib.import_module(name), "db", database)
+    return database
+
+@pytest.fixture
+def run_db(fresh_db):
+    def run(scenario):
+        async def main():
+            await fresh_db.connect()
+            try:
+                return await scenario(fresh_db)
+            finally:
+                await fresh_db.close()
+        return asyncio.run(main())
+    return run
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+@pytest.fixture
+def simulator():
+    return YandexSimulator(drivers=20, latency_ms=0)
+
+@pytest.fixture
+def run_yandex(fresh_db, simulator, monkeypatch):
+    port = free_port()
+    monkeypatch.setattr(settings, "YANDEX_API_URL", f"http://127.0.0.1:{port}/v1")
+    monkeypatch.setattr(settings, "YANDEX_PARK_ID", "test-park")
+    api = YandexFleetAPI()
+    monkeypatch.setattr(importlib.import_module("services.yandex_api"), "yandex_api", api)
+
+    def run(scenario):
+        async def main():
+            await simulator.start(port=port)
+            await fresh_db.connect()
+            try:
+                return await scenario(fresh_db, api)
+            finally:
+                await api.close()
+                await fresh_db.close()
+                await simulator.stop()
+        return asyncio.run(main())
+    return run
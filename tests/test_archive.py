@@ -0,0 +1,59 @@
+import sqlite3
+import time
+
+from config import settings
+from database.models import Transaction
+
+OLD = int(time.time()) - 200 * 86400
+
+def seed(db, count):
+    async def insert():
+        for i in range(count):
+            await db.create_transaction(Transaction(telegram_id=i, amount=10.0, status="completed" if i % 2 else "pending"))
+        await db.conn.execute('UPDATE transactions SET created_at = ?', (OLD,))
+        await db.conn.commit()
+    return insert()
+
+def test_archive_moves_rows_and_keeps_totals(run_db, tmp_path, monkeypatch):
+    archive_path = tmp_path / "archive.db"
+    monkeypatch.setattr(settings, "ARCHIVE_DATABASE_PATH", str(archive_path))
+
+    async def scenario(db):
+        await seed(db, 25)
+        before = await db.get_transaction_totals()
+        moved = await db.archive_old_rows("transactions", 90, batch_size=10)
+        cursor = await db.conn.execute('SELECT COUNT(*) FROM transactions')
+        return before, moved, (await cursor.fetchone())[0], await db.get_transaction_totals()
+
+    before, moved, remaining, after = run_db(scenario)
+    assert (moved, remaining) == (25, 0)
+    assert after == before
+    with sqlite3.connect(archive_path) as conn:
+        assert conn.execute('SELECT COUNT(*) FROM transactions').fetchone()[0] == 25
+
+def test_archive_keeps_rows_the_archive_did_not_store(run_db, tmp_path, monkeypatch):
+    archive_path = tmp_path / "archive.db"
+    monkeypatch.setattr(settings, "ARCHIVE_DATABASE_PATH", str(archive_path))
+    with sqlite3.connect(archive_path) as conn:
+        conn.execute('''CREATE TABLE transactions (
+            id INTEGER PRIMARY KEY, telegram_id INTEGER NOT NULL, amount REAL NOT NULL,
+            transaction_type TEXT, status TEXT, card_number TEXT, payme_transaction_id TEXT,
+            error_message TEXT, created_at INTEGER, updated_at INTEGER
+        )''')
+        conn.execute('''CREATE TRIGGER drop_three BEFORE INSERT ON transactions WHEN new.id = 3 BEGIN
+            SELECT RAISE(IGNORE);
+        END''')
+
+    async def scenario(db):
+        await seed(db, 5)
+        moved = await db.archive_old_rows("transactions", 90, batch_size=2)
+        cursor = await db.conn.execute('SELECT id FROM transactions')
+        cursor_rollups = await db.conn.execute(
+            "SELECT SUM(count) FROM daily_rollups WHERE source = 'transactions'"
+        )
+        return moved, [row[0] for row in await cursor.fetchall()], (await cursor_rollups.fetchone())[0]
+
+    moved, remaining, rolled_up = run_db(scenario)
+    assert moved == 4
+    assert remaining == [3]
+    assert rolled_up == 4
@@ -0,0 +1,85 @@
+import asyncio
+import gzip
+import sqlite3
+import threading
+
+import pytest
+
+from config import settings
+from database import database as database_module
+from database.models import Transaction
+from services.backup import BackupEngine
+
+@pytest.mark.parametrize("wal", [True, False])
+def test_backup_finishes_under_steady_writes(run_db, tmp_path, monkeypatch, wal):
+    monkeypatch.setattr(settings, "DATABASE_WAL_MODE", wal)
+    monkeypatch.setattr(settings, "BACKUP_DIR", str(tmp_path / "backups"))
+    monkeypatch.setattr(settings, "BACKUP_COMPRESSION", "gzip")
+    engine = BackupEngine()
+
+    async def scenario(db):
+        for i in range(2000):
+            await db.create_transaction(Transaction(telegram_id=i, amount=float(i)))
+
+        stop = asyncio.Event()
+
+        async def writer():
+            while not stop.is_set():
+                await db.create_transaction(Transaction(telegram_id=1, amount=1.0))
+
+        task = asyncio.create_task(writer())
+        try:
+            result = await asyncio.wait_for(engine.create_backup(), timeout=30)
+        finally:
+            stop.set()
+            await task
+        return result
+
+    result = run_db(scenario)
+    assert result.pages > 0
+    assert engine.get_progress_percent() == 0
+
+    restored = tmp_path / "restored.db"
+    with gzip.open(result.path, "rb") as src:
+        restored.write_bytes(src.read())
+    conn = sqlite3.connect(restored)
+    try:
+        assert conn.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+        assert conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0] >= 2000
+    finally:
+        conn.close()
+
+def test_rollback_journal_backup_does_not_hold_writes(run_db, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "DATABASE_WAL_MODE", False)
+    monkeypatch.setattr(settings, "BACKUP_PAGES_PER_STEP", 1)
+    stepped_backup = database_module.stepped_backup
+    copied = threading.Event()
+    written = threading.Event()
+
+    def slow_backup(*args):
+        pages = stepped_backup(*args)
+        copied.set()
+        written.wait(timeout=5)
+        return pages
+
+    monkeypatch.setattr(database_module, "stepped_backup", slow_backup)
+
+    async def scenario(db):
+        for i in range(500):
+            await db.create_transaction(Transaction(telegram_id=i, amount=float(i)))
+
+        snapshot = tmp_path / "snapshot.db"
+        task = asyncio.create_task(db.snapshot_to(str(snapshot)))
+        await asyncio.to_thread(copied.wait, 5)
+        await asyncio.wait_for(db.create_transaction(Transaction(telegram_id=1, amount=1.0)), timeout=1)
+        written.set()
+        return await task, snapshot
+
+    pages, snapshot = run_db(scenario)
+    assert pages > 0
+    conn = sqlite3.connect(snapshot)
+    try:
+        assert conn.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+        assert conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0] == 500
+    finally:
+        conn.close()
@@ -0,0 +1,55 @@
+import time
+
+from database.models import Driver, User
+from tools.yandex_simulator import driver_id
+
+async def create_drivers(db, yandex_ids):
+    for telegram_id, yandex_id in enumerate(yandex_ids, start=1):
+        await db.create_user(User(telegram_id=telegram_id))
+        await db.create_driver(Driver(telegram_id=telegram_id, yandex_driver_id=yandex_id))
+
+def test_batch_sync_bumps_only_unchanged_rows(run_yandex):
+    yandex_ids = [driver_id(i) for i in range(5)] + ["gone"]
+
+    async def scenario(db, api):
+        await create_drivers(db, yandex_ids)
+        assert await api.sync_drivers_batch(yandex_ids) == 5
+
+        stale = int(time.time()) - 3600
+        await db.conn.execute('UPDATE drivers SET last_sync = ?', (stale,))
+        await db.conn.commit()
+        for telegram_id in range(1, 7):
+            db.invalidate_user_context(telegram_id)
+            await db.get_user_context(telegram_id)
+
+        before = db.get_write_stats()
+        assert await api.sync_drivers_batch(yandex_ids) == 0
+        after = db.get_write_stats()
+
+        contexts = [(await db.get_user_context(telegram_id))[1] for telegram_id in range(1, 7)]
+        return after["statements"] - before["statements"], contexts, stale
+
+    statements, contexts, stale = run_yandex(scenario)
+    assert statements == 2
+    assert all(driver.last_sync.timestamp() > stale for driver in contexts[:5])
+    assert contexts[5].last_sync.timestamp() == stale
+    assert all(driver.next_refresh_at.timestamp() > time.time() for driver in contexts)
+
+def test_batch_sync_loads_hashes_only_for_returned_drivers(run_yandex, monkeypatch):
+    yandex_ids = [driver_id(i) for i in range(10)]
+
+    async def scenario(db, api):
+        await create_drivers(db, yandex_ids)
+        requested = []
+        get_profile_hashes = db.get_profile_hashes
+
+        async def spy(ids=None):
+            requested.append(ids)
+            return await get_profile_hashes(ids)
+
+        monkeypatch.setattr(db, "get_profile_hashes", spy)
+        await api.sync_drivers_batch(yandex_ids[:3] + ["gone"])
+        return requested
+
+    requested = run_yandex(scenario)
+    assert [sorted(ids) for ids in requested] == [sorted(yandex_ids[:3])]
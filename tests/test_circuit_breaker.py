@@ -0,0 +1,52 @@
+import pytest
+
+from services import circuit_breaker as module
+from services.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(module.time, "monotonic", lambda: now[0])
+    return now
+
+def test_opens_after_threshold_and_rejects(clock):
+    breaker = CircuitBreaker("test", failure_threshold=3, reset_timeout=30)
+    for _ in range(2):
+        breaker.before_call()
+        breaker.on_failure()
+    assert breaker.state == CLOSED
+
+    breaker.before_call()
+    breaker.on_failure()
+    assert breaker.state == OPEN and breaker.is_open
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    assert breaker.as_dict() == {"state": OPEN, "failures": 3, "trips": 1, "rejected": 1}
+
+def test_success_resets_failure_count(clock):
+    breaker = CircuitBreaker("test", failure_threshold=3)
+    breaker.on_failure()
+    breaker.on_failure()
+    breaker.on_success()
+    breaker.on_failure()
+    assert breaker.state == CLOSED
+
+def test_half_open_allows_a_single_probe(clock):
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=30)
+    breaker.on_failure()
+
+    clock[0] += 30
+    assert not breaker.is_open
+    breaker.before_call()
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.on_failure()
+    assert breaker.state == OPEN and breaker.trips == 2
+
+    clock[0] += 30
+    breaker.before_call()
+    breaker.on_success()
+    assert breaker.state == CLOSED
+    breaker.before_call()
@@ -0,0 +1,45 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from aiogram import Bot, Dispatcher
+from aiogram.dispatcher.event.bases import UNHANDLED
+from aiogram.types import CallbackQuery, Chat, Message, Update, User
+
+from bot.handlers import developer
+
+USER = User(id=5, is_bot=False, first_name="Driver")
+CHAT = Chat(id=5, type="private")
+
+@pytest.fixture(scope="module")
+def dispatcher():
+    dp = Dispatcher()
+    dp.include_router(developer.router)
+    return dp
+
+def message_update(text: str) -> Update:
+    return Update(update_id=1, message=Message(message_id=1, date=datetime.now(), chat=CHAT, from_user=USER, text=text))
+
+def callback_update(data: str) -> Update:
+    message = Message(message_id=1, date=datetime.now(), chat=CHAT, from_user=USER, text="💳")
+    return Update(update_id=2, callback_query=CallbackQuery(
+        id="1", from_user=USER, chat_instance="1", message=message, data=data
+    ))
+
+def feed(dp, update, role):
+    return asyncio.run(dp.feed_update(Bot(token="42:TEST"), update, role=role))
+
+@pytest.mark.parametrize("role", ["driver", "admin"])
+def test_transactions_hidden_from_non_developers(dispatcher, role):
+    assert feed(dispatcher, message_update("/transactions driver=5"), role) is UNHANDLED
+    assert feed(dispatcher, callback_update("tx:n:1700000000:1"), role) is UNHANDLED
+
+def test_transactions_open_to_developers(dispatcher, monkeypatch):
+    answers = []
+
+    async def answer(self, text, **kwargs):
+        answers.append(text)
+
+    monkeypatch.setattr(Message, "answer", answer)
+    feed(dispatcher, message_update("/transactions status=unknown"), "developer")
+    assert answers and answers[0].startswith("Usage: /transactions")
@@ -0,0 +1,44 @@
+import asyncio
+import sqlite3
+
+from config import settings
+from database.models import User
+
+def test_failed_statement_does_not_sink_its_batch(run_db, monkeypatch):
+    monkeypatch.setattr(settings, "DATABASE_GROUP_COMMIT", True)
+    monkeypatch.setattr(settings, "DATABASE_GROUP_COMMIT_MAX_DELAY_MS", 50)
+
+    async def scenario(db):
+        await db.create_user(User(telegram_id=1))
+        before = db.get_write_stats()
+
+        insert = 'INSERT INTO users (telegram_id) VALUES (?)'
+        results = await asyncio.gather(
+            db._write(insert, (2,)),
+            db._write(insert, (1,)),
+            db._write(insert, (3,)),
+            return_exceptions=True
+        )
+        after = db.get_write_stats()
+        cursor = await db.conn.execute('SELECT telegram_id FROM users ORDER BY telegram_id')
+        return results, after["commits"] - before["commits"], [row[0] for row in await cursor.fetchall()]
+
+    results, commits, users = run_db(scenario)
+    assert isinstance(results[1], sqlite3.IntegrityError)
+    assert results[0].rowcount == results[2].rowcount == 1
+    assert commits == 1
+    assert users == [1, 2, 3]
+
+def test_group_commit_is_drained_on_close(run_db, fresh_db, monkeypatch):
+    monkeypatch.setattr(settings, "DATABASE_GROUP_COMMIT", True)
+    monkeypatch.setattr(settings, "DATABASE_GROUP_COMMIT_MAX_DELAY_MS", 10000)
+
+    async def scenario(db):
+        task = asyncio.ensure_future(db._write('INSERT INTO users (telegram_id) VALUES (?)', (7,)))
+        await asyncio.sleep(0)
+        await db.group_commit.drain()
+        return (await task).rowcount
+
+    assert run_db(scenario) == 1
+    with sqlite3.connect(fresh_db.db_path) as conn:
+        assert conn.execute('SELECT COUNT(*) FROM users WHERE telegram_id = 7').fetchone()[0] == 1
@@ -0,0 +1,28 @@
+from database.models import Driver, User
+from services.yandex_api import sync_driver_data
+from tools.yandex_simulator import driver_id
+
+async def create_driver(db, telegram_id=1):
+    await db.create_user(User(telegram_id=telegram_id))
+    await db.create_driver(Driver(telegram_id=telegram_id, yandex_driver_id=driver_id(telegram_id)))
+
+def test_background_refresh_keeps_manual_allowance(run_yandex):
+    async def scenario(db, api):
+        await create_driver(db)
+        assert await api.refresh_driver(1)
+        task = api.revalidate_driver(await db.get_driver(1), force=True)
+        assert await task
+        return await db.get_driver(1)
+
+    driver = run_yandex(scenario)
+    assert driver.last_sync is not None
+    assert driver.name
+    assert driver.last_manual_sync is None
+
+def test_manual_refresh_uses_allowance(run_yandex):
+    async def scenario(db, api):
+        await create_driver(db)
+        assert await sync_driver_data(1)
+        return await db.get_driver(1)
+
+    assert run_yandex(scenario).last_manual_sync is not None
@@ -0,0 +1,67 @@
+import asyncio
+
+from database.migrations import MIGRATIONS, get_schema_version, run_migrations
+
+LATEST = MIGRATIONS[-1][0]
+
+def test_legacy_schema_migrates_to_latest(fresh_db):
+    async def scenario():
+        fresh_db.conn = await fresh_db._open_connection()
+        try:
+            await fresh_db.create_tables()
+            conn = fresh_db.conn
+            await conn.execute("INSERT INTO users (telegram_id) VALUES (1)")
+            await conn.execute(
+                "INSERT INTO drivers (telegram_id, yandex_driver_id, last_sync) VALUES (1, 'drv000001', '2024-01-02 03:04:05')"
+            )
+            await conn.executemany(
+                "INSERT INTO transactions (telegram_id, amount, status) VALUES (1, ?, ?)",
+                [(10.0, "completed"), (5.0, "completed"), (7.5, "pending")]
+            )
+            await conn.commit()
+
+            assert await run_migrations(conn) == LATEST
+            assert await run_migrations(conn) == LATEST
+
+            cursor = await conn.execute("SELECT typeof(created_at), typeof(last_sync), last_sync, next_refresh_at FROM drivers")
+            driver = await cursor.fetchone()
+            cursor = await conn.execute("SELECT DISTINCT typeof(created_at) FROM transactions")
+            tx_types = [row[0] for row in await cursor.fetchall()]
+            cursor = await conn.execute("SELECT status, count, amount FROM transaction_totals ORDER BY status")
+            totals = await cursor.fetchall()
+            return await get_schema_version(conn), driver, tx_types, totals
+        finally:
+            await fresh_db.conn.close()
+
+    version, driver, tx_types, totals = asyncio.run(scenario())
+    assert version == LATEST
+    assert driver[:2] == ("integer", "integer")
+    assert driver[3] == driver[2]
+    assert tx_types == ["integer"]
+    assert totals == [("completed", 2, 15.0), ("pending", 1, 7.5)]
+
+def test_migration_versions_are_increasing():
+    versions = [target for target, _, _ in MIGRATIONS]
+    assert versions == sorted(set(versions))
+
+def test_fts_reindexes_only_on_searchable_changes(run_db):
+    async def scenario(db):
+        await db.conn.execute("INSERT INTO users (telegram_id) VALUES (1)")
+        await db.conn.execute("INSERT INTO drivers (telegram_id, name, callsign) VALUES (1, 'Aziz', 'A1')")
+        await db.conn.commit()
+
+        changes = []
+        for sql in (
+            "UPDATE drivers SET name = 'Aziz', callsign = 'A1', balance = 5",
+            "UPDATE drivers SET name = 'Bobur'",
+        ):
+            before = db.conn.total_changes
+            await db.conn.execute(sql)
+            changes.append(db.conn.total_changes - before)
+        await db.conn.commit()
+        return changes, [driver.name for driver in await db.search_drivers("Bobur")]
+
+    changes, found = run_db(scenario)
+    assert changes[0] == 1
+    assert changes[1] > 1
+    assert found == ["Bobur"]
@@ -0,0 +1,64 @@
+import re
+
+# A SELECT without FROM (the stats snapshot's subquery row) plans as SCAN CONSTANT ROW.
+FULL_SCAN_PATTERN = re.compile(r'^SCAN (?!CONSTANT ROW)|USE TEMP B-TREE')
+
+# Each hot path is called through the real Database method, so the checked SQL is exactly what runs.
+HOT_CALLS = {
+    "get_driver_by_yandex_id": lambda db: db.get_driver_by_yandex_id(""),
+    "get_documents": lambda db: db.get_documents(0),
+    "get_pending_registrations_count": lambda db: db.get_pending_registrations_count(),
+    "get_transactions_page": lambda db: db.get_transactions_page(after=(0, 0)),
+    "get_transactions_page_by_status": lambda db: db.get_transactions_page(status="pending", after=(0, 0)),
+    "get_transactions_page_by_driver": lambda db: db.get_transactions_page(telegram_id=1, before=(0, 0)),
+    "get_refresh_candidates": lambda db: db.get_refresh_candidates(2000),
+    "count_due_refreshes": lambda db: db.count_due_refreshes(),
+    "get_stats_snapshot": lambda db: db.get_stats_snapshot(7),
+    "get_inactive_drivers": lambda db: db.get_inactive_drivers(7),
+}
+
+async def capture_queries(db, call):
+    queries = []
+    fetchone, fetchall = db._fetchone, db._fetchall
+
+    async def record_one(sql, params=()):
+        queries.append((sql, params))
+        return await fetchone(sql, params)
+
+    async def record_all(sql, params=()):
+        queries.append((sql, params))
+        return await fetchall(sql, params)
+
+    db._fetchone, db._fetchall = record_one, record_all
+    try:
+        await call(db)
+    finally:
+        del db._fetchone, db._fetchall
+    return queries
+
+async def find_full_scans(db):
+    problems = []
+
+    for name, call in HOT_CALLS.items():
+        queries = await capture_queries(db, call)
+        assert queries, name
+        for sql, params in queries:
+            cursor = await db.conn.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            for row in await cursor.fetchall():
+                detail = row[3]
+                if FULL_SCAN_PATTERN.search(detail):
+                    problems.append(f"{name}: {detail}")
+
+    return problems
+
+def test_hot_queries_use_indexes(run_db):
+    assert run_db(find_full_scans) == []
+
+def test_full_scan_pattern_flags_index_scans():
+    assert FULL_SCAN_PATTERN.search("SCAN transactions")
+    assert FULL_SCAN_PATTERN.search("SCAN transactions USING INDEX idx_transactions_created_at")
+    assert FULL_SCAN_PATTERN.search("SCAN drivers USING COVERING INDEX idx_drivers_yandex_id")
+    assert FULL_SCAN_PATTERN.search("USE TEMP B-TREE FOR ORDER BY")
+    assert not FULL_SCAN_PATTERN.search("SCAN CONSTANT ROW")
+    assert not FULL_SCAN_PATTERN.search("SEARCH drivers USING INDEX idx_drivers_yandex_id (yandex_driver_id=?)")
+    assert not FULL_SCAN_PATTERN.search("SEARCH transactions USING INTEGER PRIMARY KEY (rowid>?)")
@@ -0,0 +1,92 @@
+import time
+from types import SimpleNamespace
+
+from bot.middlewares import user_context
+from bot.middlewares.user_context import LastSeenBuffer
+from config import settings
+from database.models import Driver, User
+from services.refresh_planner import RefreshPlanner
+from tools.yandex_simulator import driver_id
+
+DAY = 86400
+
+async def create_drivers(db, count):
+    for i in range(count):
+        await db.create_user(User(telegram_id=i + 1))
+        await db.create_driver(Driver(telegram_id=i + 1, yandex_driver_id=driver_id(i)))
+
+async def schedule(db):
+    cursor = await db.conn.execute('SELECT yandex_driver_id, next_refresh_at FROM drivers ORDER BY id')
+    return dict(await cursor.fetchall())
+
+def test_cycle_stays_within_request_budget(run_yandex, monkeypatch):
+    monkeypatch.setattr(settings, "REFRESH_REQUEST_BUDGET", 2)
+    monkeypatch.setattr(settings, "YANDEX_SYNC_BATCH_SIZE", 3)
+
+    async def scenario(db, api):
+        await create_drivers(db, 10)
+        planner = RefreshPlanner()
+        first = await planner.run_cycle()
+        due_after_first = await db.count_due_refreshes()
+        second = await planner.run_cycle()
+        third = await planner.run_cycle()
+        return first, due_after_first, second, third, await db.count_due_refreshes()
+
+    first, due_after_first, second, third, due = run_yandex(scenario)
+    assert (first.planned, first.requests) == (6, 2)
+    assert due_after_first == 4
+    assert (second.planned, second.requests) == (4, 2)
+    assert third.planned == 0
+    assert due == 0
+
+def test_unchanged_drivers_are_scheduled_by_activity_tier(run_yandex):
+    async def scenario(db, api):
+        await create_drivers(db, 2)
+        await api.sync_drivers_batch([driver_id(0), driver_id(1)])
+
+        now = int(time.time())
+        await db.conn.execute('UPDATE drivers SET last_trip_date = ?, last_seen_at = NULL, balance_changed_at = NULL',
+                              (now - 60 * DAY,))
+        await db.conn.execute('UPDATE drivers SET last_trip_date = ? WHERE id = 1', (now - 60,))
+        await db.conn.commit()
+        await api.sync_drivers_batch([driver_id(0), driver_id(1)])
+        return now, await schedule(db), db.refresh_tiers
+
+    now, next_refresh, tiers = run_yandex(scenario)
+    assert abs(next_refresh[driver_id(0)] - (now + tiers[0][1])) <= 5
+    assert abs(next_refresh[driver_id(1)] - (now + tiers[-1][1])) <= 5
+
+def test_seen_driver_is_pulled_forward(run_db):
+    async def scenario(db):
+        await create_drivers(db, 1)
+        synced = int(time.time()) - 3600
+        await db.conn.execute('UPDATE drivers SET last_sync = ?, next_refresh_at = ?', (synced, synced + 7 * DAY))
+        await db.conn.commit()
+        await db.touch_drivers_seen([1])
+        return synced, await schedule(db), await db.get_refresh_candidates(10), db.refresh_tiers
+
+    synced, next_refresh, candidates, tiers = run_db(scenario)
+    assert next_refresh[driver_id(0)] == synced + tiers[0][1]
+    assert candidates == [(driver_id(0), 0)]
+
+def test_last_seen_is_flushed_outside_the_handler(run_db, monkeypatch):
+    buffer = LastSeenBuffer(flush_interval_ms=60000)
+    monkeypatch.setattr(user_context, "last_seen_buffer", buffer)
+
+    async def scenario(db):
+        await create_drivers(db, 2)
+        seen_in_handler = []
+
+        async def handler(event, data):
+            cursor = await db.conn.execute('SELECT last_seen_at FROM drivers WHERE last_seen_at IS NOT NULL')
+            seen_in_handler.extend(await cursor.fetchall())
+
+        middleware = user_context.UserContextMiddleware()
+        for telegram_id in (1, 2, 1):
+            await middleware(handler, None, {"event_from_user": SimpleNamespace(id=telegram_id)})
+        await buffer.close()
+
+        cursor = await db.conn.execute('SELECT COUNT(*) FROM drivers WHERE last_seen_at IS NOT NULL')
+        return seen_in_handler, (await cursor.fetchone())[0]
+
+    assert run_db(scenario) == ([], 2)
@@ -0,0 +1,21 @@
+import asyncio
+import time
+
+import aiohttp
+import pytest
+
+from services.yandex_api import PROFILES_ENDPOINT
+
+def test_session_timeout_applies_without_per_call_timeout(run_yandex, simulator):
+    simulator.latency = 2.0
+
+    async def scenario(db, api):
+        api.session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=0.2))
+        started = time.monotonic()
+        with pytest.raises(asyncio.TimeoutError):
+            await api._request(PROFILES_ENDPOINT, {"query": {"park": {"id": api.park_id}}})
+        return time.monotonic() - started, api.circuit_breaker.failures
+
+    elapsed, failures = run_yandex(scenario)
+    assert elapsed < 1.5
+    assert failures == 1
@@ -0,0 +1,22 @@
+import asyncio
+
+from database.models import Driver, User
+from tools.yandex_simulator import driver_id
+
+def test_concurrent_refreshes_share_one_request(run_yandex, simulator):
+    simulator.latency = 0.1
+
+    async def scenario(db, api):
+        await db.create_user(User(telegram_id=1))
+        await db.create_driver(Driver(telegram_id=1, yandex_driver_id=driver_id(1)))
+
+        results = await asyncio.gather(*(api.refresh_driver(1) for _ in range(10)))
+        requests_after_burst = simulator.stats["requests"]
+        assert await api.refresh_driver(1)
+        return results, requests_after_burst, api.get_refresh_stats()
+
+    results, requests_after_burst, stats = run_yandex(scenario)
+    assert all(results)
+    assert requests_after_burst == 1
+    assert simulator.stats["requests"] == 1
+    assert stats == {"requests": 11, "cache_hits": 1, "coalesced": 9, "fetched": 1}
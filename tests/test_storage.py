@@ -0,0 +1,31 @@
+from aiogram.fsm.storage.base import StorageKey
+
+from bot.storage import SQLiteStorage
+
+def key(user_id: int) -> StorageKey:
+    return StorageKey(bot_id=1, chat_id=user_id, user_id=user_id)
+
+def test_reads_are_bounded_by_cache_size(run_db):
+    async def scenario(db):
+        storage = SQLiteStorage(flush_interval_ms=10, cache_size=2)
+        for user_id in range(1000):
+            assert await storage.get_state(key(user_id)) is None
+            assert len(storage._records) <= 2
+        await storage.close()
+
+    run_db(scenario)
+
+def test_dirty_records_survive_eviction_and_persist(run_db):
+    async def scenario(db):
+        storage = SQLiteStorage(flush_interval_ms=60000, cache_size=2)
+        await storage.set_state(key(1), "form:name")
+        await storage.set_data(key(2), {"step": 2})
+        for user_id in range(3, 50):
+            await storage.get_state(key(user_id))
+        assert await storage.get_state(key(1)) == "form:name"
+        await storage.close()
+
+        reloaded = SQLiteStorage(cache_size=2)
+        return await reloaded.get_state(key(1)), await reloaded.get_data(key(2))
+
+    assert run_db(scenario) == ("form:name", {"step": 2})
@@ -0,0 +1,58 @@
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+from database.models import Driver, User
+from services.yandex_api import data_age, yandex_api
+
+ROW = {
+    "yandex_driver_id": "drv000001",
+    "name": "Aziz Aliyev",
+    "callsign": "00001",
+    "car_model": "Chevrolet Cobalt",
+    "balance": 1500.0,
+    "last_trip_date": datetime(2026, 1, 1, tzinfo=timezone.utc),
+    "last_trip_sum": 0.0,
+    "is_active": True,
+}
+
+async def create_linked_driver(db, telegram_id=1, yandex_id="drv000001"):
+    await db.create_user(User(telegram_id=telegram_id))
+    await db.create_driver(Driver(telegram_id=telegram_id, yandex_driver_id=yandex_id))
+
+def test_unchanged_profiles_count_as_fresh(run_db):
+    async def scenario(db):
+        await create_linked_driver(db)
+        summary = Counter()
+        await yandex_api._write_changed([ROW], await db.get_profile_hashes(), summary)
+
+        stale = int(time.time()) - 3600
+        await db.conn.execute('UPDATE drivers SET last_sync = ?, updated_at = ?', (stale, stale))
+        await db.conn.commit()
+        db.invalidate_user_context(1)
+        _, cached = await db.get_user_context(1)
+        assert data_age(cached) >= 3600
+
+        await yandex_api._write_changed([ROW], await db.get_profile_hashes(), summary)
+        _, driver = await db.get_user_context(1)
+        return summary, data_age(driver), driver.updated_at.timestamp()
+
+    summary, age, updated_at = run_db(scenario)
+    assert summary == Counter(changed=1, unchanged=1)
+    assert age < 60
+    assert updated_at < time.time() - 3000
+
+def test_never_synced_driver_has_unknown_age_and_revalidates(run_yandex):
+    async def scenario(db, api):
+        await create_linked_driver(db)
+        await db.update_driver(1, is_active=False)
+        driver = await db.get_driver(1)
+        age = data_age(driver)
+        task = api.revalidate_driver(driver)
+        refreshed = await task if task else None
+        return age, refreshed, data_age(await db.get_driver(1))
+
+    age, refreshed, age_after = run_yandex(scenario)
+    assert age is None
+    assert refreshed is True
+    assert age_after < 60
@@ -0,0 +1,16 @@
+from database.models import Transaction
+
+def test_totals_follow_inserts_and_status_changes(run_db):
+    async def scenario(db):
+        first = await db.create_transaction(Transaction(telegram_id=1, amount=100.0))
+        await db.create_transaction(Transaction(telegram_id=2, amount=50.0))
+        await db.create_transaction(Transaction(telegram_id=3, amount=25.0, status="failed"))
+        await db.update_transaction(first.id, status="completed")
+        await db.update_transaction(first.id, amount=120.0)
+        return await db.get_transaction_totals()
+
+    assert run_db(scenario) == {
+        "completed": (1, 120.0),
+        "pending": (1, 50.0),
+        "failed": (1, 25.0),
+    }
@@ -0,0 +1,24 @@
+from database.models import Transaction
+
+def test_keyset_pages_cover_ties_without_gaps(run_db):
+    async def scenario(db):
+        for i in range(25):
+            await db.create_transaction(Transaction(telegram_id=i % 3, amount=float(i)))
+        await db.conn.execute('UPDATE transactions SET created_at = 1700000000 + id / 10')
+        await db.conn.commit()
+
+        pages = [await db.get_transactions_page(limit=10)]
+        while len(pages[-1]) == 10:
+            last = pages[-1][-1]
+            pages.append(await db.get_transactions_page(limit=10, after=(last.created_at, last.id)))
+
+        first = pages[1][0]
+        back = await db.get_transactions_page(limit=10, before=(first.created_at, first.id))
+        by_driver = await db.get_transactions_page(limit=100, telegram_id=2)
+        return pages, back, by_driver
+
+    pages, back, by_driver = run_db(scenario)
+    ids = [tx.id for page in pages for tx in page]
+    assert ids == list(range(25, 0, -1))
+    assert [tx.id for tx in back] == [tx.id for tx in pages[0]]
+    assert {tx.telegram_id for tx in by_driver} == {2}
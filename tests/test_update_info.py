@@ -0,0 +1,55 @@
+
+from bot.handlers.driver import update_info
+from database.models import Driver, User
+from utils import get_message
+from tools.yandex_simulator import driver_id
+
+class FakeMessage:
+    def __init__(self):
+        self.answers = []
+
+    async def answer(self, text, **kwargs):
+        self.answers.append(text)
+
+async def press_update(db, yandex_id):
+    await db.create_user(User(telegram_id=1))
+    await db.create_driver(Driver(telegram_id=1, yandex_driver_id=yandex_id))
+    message = FakeMessage()
+    await update_info(message, await db.get_driver(1), "ru")
+    return message.answers, await db.get_driver(1)
+
+def test_success_only_when_refresh_completes(run_yandex):
+    answers, driver = run_yandex(lambda db, api: press_update(db, driver_id(1)))
+    assert answers[-1] == get_message("update_info_success", "ru")
+    assert driver.last_manual_sync is not None
+
+def test_failed_refresh_reports_error(run_yandex):
+    answers, driver = run_yandex(lambda db, api: press_update(db, "missing"))
+    assert answers[-1] == get_message("update_info_error", "ru")
+    assert driver.last_manual_sync is None
+
+def test_slow_refresh_shows_stored_data(run_yandex, simulator, monkeypatch):
+    from config import settings
+    monkeypatch.setattr(settings, "YANDEX_REFRESH_WAIT_SECONDS", 0.05)
+    simulator.latency = 0.5
+
+    async def scenario(db, api):
+        answers, _ = await press_update(db, driver_id(1))
+        for task in list(api._revalidations):
+            await task
+        return answers, await db.get_driver(1)
+
+    answers, driver = run_yandex(scenario)
+    assert answers[-1].endswith(get_message("data_refreshing", "ru"))
+    assert get_message("update_info_success", "ru") not in answers
+    assert driver.last_manual_sync is not None
+
+def test_open_circuit_shows_stored_data(run_yandex):
+    async def scenario(db, api):
+        for _ in range(api.circuit_breaker.failure_threshold):
+            api.circuit_breaker.on_failure()
+        return await press_update(db, driver_id(1))
+
+    answers, driver = run_yandex(scenario)
+    assert answers[-1].endswith(get_message("yandex_unavailable", "ru"))
+    assert driver.last_manual_sync is None
@@ -0,0 +1,176 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from tools.yandex_simulator import driver_id
+
+ROOT = Path(__file__).resolve().parent.parent
+SCENARIOS = ("full", "recent", "incremental", "batch", "driver")
+COLUMNS = ("drivers", "scenario", "synced", "wall_s", "requests", "req_per_s", "commits", "statements", "peak_rss_mb")
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Benchmark Yandex sync paths against the local simulator")
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--server-rate-limit", type=float, default=0, help="simulator 429 threshold (0 = unlimited)")
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-burst", type=int, default=1)
+    parser.add_argument("--client-rate", type=float, default=100, help="YANDEX_RATE_LIMIT for the client")
+    parser.add_argument("--concurrency", type=int, default=4, help="YANDEX_FETCH_CONCURRENCY for full refresh")
+    parser.add_argument("--driver-sample", type=int, default=200, help="drivers refreshed one by one in the driver scenario")
+    parser.add_argument("--warm", action="store_true", help="run a full refresh before each measured scenario")
+    parser.add_argument("--worker", choices=SCENARIOS, help=argparse.SUPPRESS)
+    parser.add_argument("--size", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--base-url", help=argparse.SUPPRESS)
+    return parser
+
+async def run_scenario(args: argparse.Namespace) -> dict:
+    with tempfile.TemporaryDirectory(prefix="sync_bench_") as tmp_dir:
+        return await measure_scenario(args, str(Path(tmp_dir) / "bench.db"))
+
+async def measure_scenario(args: argparse.Namespace, db_path: str) -> dict:
+    os.environ.update({
+        "DATABASE_PATH": db_path,
+        "YANDEX_API_URL": args.base_url,
+        "YANDEX_PARK_ID": os.getenv("YANDEX_PARK_ID", "bench-park"),
+        "YANDEX_RATE_LIMIT": str(args.client_rate),
+        "YANDEX_FETCH_CONCURRENCY": str(args.concurrency),
+        "YANDEX_REFRESH_CACHE_TTL": "0",
+    })
+
+    from database import db
+    from services.yandex_api import yandex_api
+
+    await db.connect()
+    try:
+        await db.conn.executemany(
+            "INSERT INTO drivers (telegram_id, yandex_driver_id) VALUES (?, ?)",
+            [(i + 1, driver_id(i)) for i in range(args.size)]
+        )
+        await db.conn.commit()
+
+        if args.warm:
+            await yandex_api.fetch_all_drivers()
+
+        writes_before = db.get_write_stats()
+        requests_before = yandex_api.get_connection_stats()["requests"]
+        started = time.perf_counter()
+
+        if args.worker == "full":
+            synced = await yandex_api.fetch_all_drivers()
+        elif args.worker == "recent":
+            synced = await yandex_api.fetch_recent_drivers(1, notify_channel=False)
+        elif args.worker == "incremental":
+            synced = await yandex_api.fetch_active_drivers(notify_channel=False)
+        elif args.worker == "batch":
+            synced = await yandex_api.sync_drivers_batch([driver_id(i) for i in range(args.size)])
+        else:
+            sample = range(1, min(args.driver_sample, args.size) + 1)
+            results = await asyncio.gather(*(yandex_api.refresh_driver(telegram_id) for telegram_id in sample))
+            synced = sum(results)
+
+        wall = time.perf_counter() - started
+        writes_after = db.get_write_stats()
+        requests = yandex_api.get_connection_stats()["requests"] - requests_before
+        return {
+            "drivers": args.size,
+            "scenario": args.worker,
+            "synced": synced,
+            "wall_s": round(wall, 2),
+            "requests": requests,
+            "req_per_s": round(requests / wall, 1) if wall else 0.0,
+            "commits": writes_after["commits"] - writes_before["commits"],
+            "statements": writes_after["statements"] - writes_before["statements"],
+            "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        }
+    finally:
+        await yandex_api.close()
+        await db.close()
+
+def wait_for_port(port: int, process: subprocess.Popen, timeout: float = 120):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Simulator exited with code {process.returncode}")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Simulator did not start on port {port}")
+
+def start_simulator(args: argparse.Namespace, size: int) -> subprocess.Popen:
+    command = [
+        sys.executable, "-m", "tools.yandex_simulator",
+        "--drivers", str(size),
+        "--port", str(args.port),
+        "--latency-ms", str(args.latency_ms),
+        "--jitter-ms", str(args.jitter_ms),
+        "--rate-limit", str(args.server_rate_limit),
+        "--retry-after", str(args.retry_after),
+        "--error-rate", str(args.error_rate),
+        "--error-burst", str(args.error_burst),
+    ]
+    process = subprocess.Popen(command, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    wait_for_port(args.port, process)
+    return process
+
+def run_worker(args: argparse.Namespace, size: int, scenario: str) -> dict:
+    command = [
+        sys.executable, "-m", "tools.benchmark_sync",
+        "--worker", scenario,
+        "--size", str(size),
+        "--base-url", f"http://127.0.0.1:{args.port}/v1",
+        "--client-rate", str(args.client_rate),
+        "--concurrency", str(args.concurrency),
+        "--driver-sample", str(args.driver_sample),
+    ]
+    if args.warm:
+        command.append("--warm")
+
+    result = subprocess.run(command, cwd=ROOT, stdout=subprocess.PIPE, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"{scenario} at {size} drivers failed with code {result.returncode}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def print_row(values):
+    print("  ".join(f"{str(v):>11}" for v in values), flush=True)
+
+def main(args: argparse.Namespace):
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        raise SystemExit(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+
+    print_row(COLUMNS)
+    for size in sizes:
+        simulator = start_simulator(args, size)
+        try:
+            for scenario in scenarios:
+                result = run_worker(args, size, scenario)
+                print_row(result[column] for column in COLUMNS)
+        finally:
+            simulator.terminate()
+            simulator.wait()
+
+if __name__ == "__main__":
+    arguments = build_parser().parse_args()
+    if arguments.worker:
+        logging.basicConfig(level=logging.WARNING, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+        print(json.dumps(asyncio.run(run_scenario(arguments))))
+    else:
+        main(arguments)
@@ -0,0 +1,241 @@
+import argparse
+import asyncio
+import logging
+import random
+import time
+from collections import Counter, deque
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+PROFILES_PATH = "/parks/driver-profiles/list"
+MAX_LIMIT = 1000
+
+FIRST_NAMES = ["Aziz", "Bekzod", "Dilshod", "Jasur", "Otabek", "Rustam", "Sardor", "Timur"]
+LAST_NAMES = ["Aliyev", "Karimov", "Nazarov", "Rahimov", "Saidov", "Tursunov", "Usmonov", "Yusupov"]
+CARS = [("Chevrolet", "Cobalt"), ("Chevrolet", "Nexia"), ("Chevrolet", "Gentra"), ("Kia", "K5"), ("Hyundai", "Sonata")]
+
+def driver_id(index: int) -> str:
+    return f"drv{index:06d}"
+
+def isoformat(dt: datetime) -> str:
+    return dt.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+
+def parse_datetime(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+class YandexSimulator:
+    def __init__(self, drivers: int = 1000, latency_ms: float = 50, jitter_ms: float = 0,
+                 rate_limit: float = 0, retry_after: float = 1.0, error_rate: float = 0.0,
+                 error_burst: int = 1, seed: int = 0):
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.error_rate = error_rate
+        self.error_burst = error_burst
+        self.random = random.Random(seed)
+        self.stats = Counter()
+        self._recent = deque()
+        self._errors_left = 0
+        self.runner: Optional[web.AppRunner] = None
+
+        now = datetime.now(timezone.utc)
+        self.profiles: List[dict] = []
+        for i in range(drivers):
+            brand, model = CARS[i % len(CARS)]
+            self.profiles.append({
+                "driver_profile": {
+                    "id": driver_id(i),
+                    "first_name": FIRST_NAMES[i % len(FIRST_NAMES)],
+                    "last_name": LAST_NAMES[(i // len(FIRST_NAMES)) % len(LAST_NAMES)],
+                    "phones": [f"+99890{i:07d}"],
+                    "created_date": isoformat(now - timedelta(minutes=i * 5)),
+                    "work_status": "working",
+                },
+                "car": {"brand": brand, "model": model, "callsign": f"{i % 100000:05d}"},
+                "accounts": [{
+                    "id": f"acc{i:06d}",
+                    "balance": f"{self.random.uniform(-50000, 500000):.2f}",
+                    "currency": "UZS",
+                    "last_transaction_date": isoformat(now - timedelta(seconds=self.random.randint(0, 30 * 86400))),
+                }],
+                "current_status": {"status": "offline"},
+            })
+        self.by_id = {p["driver_profile"]["id"]: p for p in self.profiles}
+
+    def mutate(self, fraction: float) -> int:
+        now = datetime.now(timezone.utc)
+        changed = self.random.sample(self.profiles, int(len(self.profiles) * fraction))
+        for profile in changed:
+            account = profile["accounts"][0]
+            account["balance"] = f"{float(account['balance']) + self.random.uniform(-20000, 80000):.2f}"
+            account["last_transaction_date"] = isoformat(now)
+        return len(changed)
+
+    def _throttled(self) -> bool:
+        if not self.rate_limit:
+            return False
+        now = time.monotonic()
+        while self._recent and now - self._recent[0] >= 1.0:
+            self._recent.popleft()
+        if len(self._recent) >= self.rate_limit:
+            return True
+        self._recent.append(now)
+        return False
+
+    def _failing(self) -> bool:
+        if self._errors_left:
+            self._errors_left -= 1
+            return True
+        if self.error_rate and self.random.random() < self.error_rate:
+            self._errors_left = self.error_burst - 1
+            return True
+        return False
+
+    def _select(self, query: dict) -> List[dict]:
+        park = query.get("park") or {}
+        ids = (park.get("driver_profile") or {}).get("id")
+        if ids:
+            ids = [ids] if isinstance(ids, str) else ids
+            return [self.by_id[i] for i in ids if i in self.by_id]
+
+        profiles = self.profiles
+        window = (park.get("account") or {}).get("last_transaction_date")
+        if window:
+            since = parse_datetime(window["from"]) if window.get("from") else None
+            until = parse_datetime(window["to"]) if window.get("to") else None
+            profiles = [
+                p for p in profiles
+                if (since is None or parse_datetime(p["accounts"][0]["last_transaction_date"]) >= since)
+                and (until is None or parse_datetime(p["accounts"][0]["last_transaction_date"]) < until)
+            ]
+        return profiles
+
+    @staticmethod
+    def _sort(profiles: List[dict], sort_order: list) -> List[dict]:
+        for order in reversed(sort_order or []):
+            group, _, field = order.get("field", "").partition(".")
+            if group != "driver_profile":
+                continue
+            profiles = sorted(
+                profiles,
+                key=lambda p: p["driver_profile"].get(field) or "",
+                reverse=order.get("direction") == "desc"
+            )
+        return profiles
+
+    @staticmethod
+    def _project(profile: dict, fields: Optional[dict]) -> dict:
+        if not fields:
+            return profile
+        projected = {}
+        for group, keys in fields.items():
+            value = profile.get(group)
+            if isinstance(value, list):
+                projected[group] = [{k: item[k] for k in keys if k in item} for item in value]
+            elif isinstance(value, dict):
+                projected[group] = {k: value[k] for k in keys if k in value}
+        return projected
+
+    async def handle_profiles(self, request: web.Request) -> web.Response:
+        self.stats["requests"] += 1
+        if self._throttled():
+            self.stats["throttled"] += 1
+            return web.json_response(
+                {"code": "429", "message": "Too many requests"},
+                status=429,
+                headers={"Retry-After": str(self.retry_after)}
+            )
+
+        delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0)
+        if delay:
+            await asyncio.sleep(delay)
+
+        if self._failing():
+            self.stats["errors"] += 1
+            return web.json_response({"code": "503", "message": "Service unavailable"}, status=503)
+
+        try:
+            body = await request.json()
+        except ValueError:
+            return web.json_response({"code": "400", "message": "Invalid JSON"}, status=400)
+
+        limit = min(int(body.get("limit") or MAX_LIMIT), MAX_LIMIT)
+        offset = int(body.get("offset") or 0)
+        profiles = self._sort(self._select(body.get("query") or {}), body.get("sort_order"))
+        page = profiles[offset:offset + limit]
+
+        self.stats["profiles"] += len(page)
+        return web.json_response({
+            "driver_profiles": [self._project(p, body.get("fields")) for p in page],
+            "limit": limit,
+            "offset": offset,
+            "total": len(profiles),
+        })
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post(PROFILES_PATH, self.handle_profiles)
+        app.router.add_post(f"/v1{PROFILES_PATH}", self.handle_profiles)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8089) -> str:
+        self.runner = web.AppRunner(self.app(), access_log=None)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, host, port).start()
+        logger.info(f"Yandex simulator serving {len(self.profiles)} drivers on http://{host}:{port}")
+        return f"http://{host}:{port}/v1"
+
+    async def stop(self):
+        if self.runner:
+            await self.runner.cleanup()
+            self.runner = None
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Local stand-in for the Yandex Fleet driver profiles API")
+    parser.add_argument("--drivers", type=int, default=1000)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--rate-limit", type=float, default=0, help="requests/second before 429 (0 = unlimited)")
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="probability that a 5xx burst starts")
+    parser.add_argument("--error-burst", type=int, default=1, help="consecutive 5xx responses per burst")
+    parser.add_argument("--mutate-every", type=float, default=0, help="seconds between activity bursts (0 = static park)")
+    parser.add_argument("--mutate-fraction", type=float, default=0.01, help="share of drivers touched per burst")
+    parser.add_argument("--seed", type=int, default=0)
+    return parser
+
+async def serve(args: argparse.Namespace):
+    simulator = YandexSimulator(
+        drivers=args.drivers,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        rate_limit=args.rate_limit,
+        retry_after=args.retry_after,
+        error_rate=args.error_rate,
+        error_burst=args.error_burst,
+        seed=args.seed
+    )
+    await simulator.start(args.host, args.port)
+    try:
+        while True:
+            if not args.mutate_every:
+                await asyncio.Event().wait()
+            await asyncio.sleep(args.mutate_every)
+            logger.info(f"Activity burst touched {simulator.mutate(args.mutate_fraction)} drivers")
+    finally:
+        await simulator.stop()
+        logger.info(f"Yandex simulator stats: {dict(simulator.stats)}")
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    try:
+        asyncio.run(serve(build_parser().parse_args()))
+    except KeyboardInterrupt:
+        pass
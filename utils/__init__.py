@@ -1,2 +1,2 @@
-from .messages import get_message
+from .messages import get_message, format_data_age
 from .validators import validate_phone, normalize_card_number
@@ -1,3 +1,5 @@
+from typing import Optional
+
 MESSAGES = {
     "uz": {
         "select_language": "Tilni tanlang / Выберите язык",
@@ -58,6 +60,12 @@ MESSAGES = {
         "withdrawal_menu": "💸 Pul yechish\n\nJoriy balans: {balance} so'm",
         "withdrawal_not_implemented": "💸 Pul yechish funksiyasi hozircha ishlamaydi.\nTez orada faollashtiriladi!",
 
+        "data_age_minutes": "🕒 Ma'lumotlar {minutes} daqiqa oldin yangilangan",
+        "data_age_hours": "🕒 Ma'lumotlar {hours} soat oldin yangilangan",
+        "data_age_unknown": "🕒 Ma'lumotlar hali yangilanmagan",
+        "data_refreshing": "🔄 Ma'lumotlar yangilanmoqda, birozdan so'ng qayta tekshiring",
+        "yandex_unavailable": "⚠️ Yandex vaqtincha javob bermayapti. Saqlangan ma'lumotlar ko'rsatildi.",
+
         "inactive_check": "❓ Salom! Oxirgi 7 kun ichida sayohatingiz bo'lmadi.\nHamma narsa yaxshimi?",
         "inactive_yes": "✅ Ha, hammasi yaxshi",
         "inactive_no": "❌ Yo'q, muammo bor",
@@ -78,6 +86,7 @@ MESSAGES = {
         "download_logs": "📥 Loglarni yuklash",
         "download_backup": "💾 Backup yuklash",
         "view_transactions": "💳 Tranzaksiyalar",
+        "system_stats": "🩺 Tizim holati",
 
         "error_occurred": "❌ Xatolik yuz berdi. Qaytadan urinib ko'ring.",
         "not_authorized": "⛔️ Sizda bu funksiyaga kirish huquqi yo'q.",
@@ -145,6 +154,12 @@ MESSAGES = {
         "withdrawal_menu": "💸 Вывод средств\n\nТекущий баланс: {balance} сум",
         "withdrawal_not_implemented": "💸 Функция вывода средств пока не работает.\nСкоро будет активирована!",
 
+        "data_age_minutes": "🕒 Данные обновлены {minutes} мин назад",
+        "data_age_hours": "🕒 Данные обновлены {hours} ч назад",
+        "data_age_unknown": "🕒 Данные ещё не обновлялись",
+        "data_refreshing": "🔄 Данные обновляются, проверьте чуть позже",
+        "yandex_unavailable": "⚠️ Yandex временно не отвечает. Показаны сохранённые данные.",
+
         "inactive_check": "❓ Здравствуйте! У вас не было поездок последние 7 дней.\nВсе в порядке?",
         "inactive_yes": "✅ Да, все хорошо",
         "inactive_no": "❌ Нет, есть проблема",
@@ -165,6 +180,7 @@ MESSAGES = {
         "download_logs": "📥 Скачать логи",
         "download_backup": "💾 Скачать backup",
         "view_transactions": "💳 Транзакции",
+        "system_stats": "🩺 Состояние системы",
 
         "error_occurred": "❌ Произошла ошибка. Попробуйте снова.",
         "not_authorized": "⛔️ У вас нет доступа к этой функции.",
@@ -174,6 +190,13 @@ MESSAGES = {
     }
 }
 
+def format_data_age(age: Optional[float], lang: str = "uz") -> str:
+    if age is None:
+        return get_message("data_age_unknown", lang)
+    if age < 3600:
+        return get_message("data_age_minutes", lang, minutes=int(age // 60))
+    return get_message("data_age_hours", lang, hours=int(age // 3600))
+
 def get_message(key: str, lang: str = "uz", **kwargs) -> str:
     message = MESSAGES.get(lang, MESSAGES["uz"]).get(key, key)
     if kwargs:
@@ -0,0 +1,30 @@
+import re
+
+CYRILLIC_TO_LATIN = {
+    "а": "a", "б": "b", "в": "v", "г": "g", "д": "d", "е": "e", "ё": "yo",
+    "ж": "j", "з": "z", "и": "i", "й": "y", "к": "k", "л": "l", "м": "m",
+    "н": "n", "о": "o", "п": "p", "р": "r", "с": "s", "т": "t", "у": "u",
+    "ф": "f", "х": "h", "ц": "ts", "ч": "ch", "ш": "sh", "щ": "sh", "ъ": "",
+    "ы": "i", "ь": "", "э": "e", "ю": "yu", "я": "ya",
+    "ў": "u", "қ": "k", "ғ": "g", "ҳ": "h",
+}
+
+# Applied after transliteration so Uzbek Latin, Russian-style Latin and
+# transliterated Cyrillic spellings of the same name meet in one form.
+LATIN_FOLDS = [
+    (re.compile(r"o[ʻʼ'`’‘]"), "u"),
+    (re.compile(r"[ʻʼ'`’‘]"), ""),
+    (re.compile(r"kh"), "h"),
+    (re.compile(r"zh"), "j"),
+    (re.compile(r"x"), "h"),
+    (re.compile(r"q"), "k"),
+    (re.compile(r"c(?!h)"), "k"),
+    (re.compile(r"w"), "v"),
+]
+
+def fold_text(*parts) -> str:
+    text = " ".join(str(part) for part in parts if part).lower()
+    text = "".join(CYRILLIC_TO_LATIN.get(ch, ch) for ch in text)
+    for pattern, replacement in LATIN_FOLDS:
+        text = pattern.sub(replacement, text)
+    return text